@@ -9,6 +9,7 @@ from .spaces import SpaceExtractor, SpaceData
 from .doors import DoorExtractor, DoorData
 from .walls import WallExtractor, WallData
 from .stairs import StairExtractor, StairData
+from ._cache import enable_disk_cache
 
 __all__ = [
     "SpaceExtractor",
@@ -19,4 +20,5 @@ __all__ = [
     "WallData",
     "StairExtractor",
     "StairData",
+    "enable_disk_cache",
 ]
@@ -0,0 +1,123 @@
+"""
+On-disk cache of extracted element data.
+
+Entries are keyed on the IFC file's path, modification time and size,
+the ifcopenshell version and the fields of the extracted data, so later
+runs on an unchanged model skip the extractor work entirely. Entries are
+plain JSON, so reading one never executes code.
+"""
+
+import hashlib
+import logging
+import os
+from dataclasses import fields
+from pathlib import Path
+from typing import Callable, List, Optional, Type, TypeVar
+
+import ifcopenshell
+import orjson
+
+from geometry.cache import file_cache_key
+from geometry.clearance import BoundingBox
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+# Bump when the extracted data layout changes to invalidate old entries
+CACHE_VERSION = 2
+
+# Fields stored as JSON arrays that the data classes hold as tuples
+_TUPLE_FIELDS = ("centroid", "location")
+
+
+def cache_key(model_path: Path) -> str:
+    """Key identifying one version of an IFC file on disk."""
+    return file_cache_key(model_path, CACHE_VERSION, ifcopenshell.version)
+
+
+def _schema_key(data_cls: type) -> str:
+    """Key identifying the fields of an extracted data class."""
+    layout = ",".join(f"{f.name}:{f.type}" for f in fields(data_cls))
+    return hashlib.blake2b(layout.encode(), digest_size=8).hexdigest()
+
+
+def enable_disk_cache(
+    model: ifcopenshell.file, model_path: Path, cache_dir: Path
+) -> None:
+    """
+    Let extractors of this model cache their results under cache_dir.
+
+    Args:
+        model: IFC model opened from model_path
+        model_path: Path of the IFC file
+        cache_dir: Root directory for cache entries
+    """
+    model._extract_cache_dir = Path(cache_dir) / cache_key(model_path)
+
+
+def _to_row(data) -> dict:
+    """Convert extracted data to a JSON-ready dict without the entity."""
+    row = {f.name: getattr(data, f.name) for f in fields(data) if f.name != "element"}
+    if row.get("bounding_box") is not None:
+        row["bounding_box"] = row["bounding_box"].as_tuple()
+    return row
+
+
+def _from_row(data_cls: Type[T], model: ifcopenshell.file, row: dict) -> T:
+    """Rebuild extracted data from a cached row."""
+    if row.get("bounding_box") is not None:
+        row["bounding_box"] = BoundingBox(*row["bounding_box"])
+    for name in _TUPLE_FIELDS:
+        if row.get(name) is not None:
+            row[name] = tuple(row[name])
+    return data_cls(element=model.by_id(row["id"]), **row)
+
+
+def load_or_extract(
+    model: ifcopenshell.file,
+    name: str,
+    data_cls: Type[T],
+    extract: Callable[[], List[T]],
+) -> List[T]:
+    """
+    Load extracted data from the disk cache, or extract and store it.
+
+    Falls back to plain extraction when caching is not enabled for the
+    model or the cache cannot be read or written; failures other than a
+    missing entry are logged.
+
+    Args:
+        model: IFC model
+        name: Cache entry name (e.g. "doors")
+        data_cls: Dataclass of the extracted items
+        extract: Function extracting the items from the model
+
+    Returns:
+        List of extracted items
+    """
+    cache_dir: Optional[Path] = getattr(model, "_extract_cache_dir", None)
+    if cache_dir is None:
+        return extract()
+
+    path = cache_dir / f"{name}-{_schema_key(data_cls)}.json"
+    try:
+        rows = orjson.loads(path.read_bytes())
+        return [_from_row(data_cls, model, row) for row in rows]
+    except FileNotFoundError:
+        pass
+    except (OSError, orjson.JSONDecodeError) as e:
+        logger.warning("Ignoring unreadable extraction cache %s: %s", path, e)
+
+    items = extract()
+
+    try:
+        data = orjson.dumps([_to_row(d) for d in items])
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+    except (OSError, orjson.JSONEncodeError) as e:
+        logger.warning("Could not write extraction cache %s: %s", path, e)
+
+    return items
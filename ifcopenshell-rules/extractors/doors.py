@@ -2,17 +2,29 @@
 IfcDoor extraction utilities.
 """
 
+import threading
+from collections import defaultdict
 from dataclasses import dataclass, field
 from typing import Optional, List, Dict, Any
 
 import ifcopenshell
-import ifcopenshell.util.element
-
-from geometry.clearance import get_bounding_box, get_opening_width, BoundingBox
-from geometry.distance import get_element_centroid, get_element_location
-
-
-@dataclass
+import numpy as np
+
+from geometry.clearance import (
+    precompute_bounding_boxes,
+    get_opening_width,
+    BoundingBox,
+    BoundingBoxArray,
+)
+from geometry.cache import geometry_cache
+from geometry.distance import get_element_location
+from ._cache import load_or_extract
+from .psets import get_pset_index
+from .schema import has_attribute
+from .spatial import get_container_map
+
+
+@dataclass(slots=True, frozen=True)
 class DoorData:
     """Extracted data from an IfcDoor."""
 
@@ -56,26 +68,102 @@ class DoorExtractor:
     def __init__(self, model: ifcopenshell.file):
         self.model = model
         self._cache: Dict[int, DoorData] = {}
+        self._bboxes: Optional[BoundingBoxArray] = None
+        self._storey_map: Optional[Dict[int, Optional[str]]] = None
+        self._pset_index: Optional[Dict[int, Dict[str, dict]]] = None
+        self._lock = threading.Lock()
+        self._all_lock = threading.Lock()
+        self._has_predef = has_attribute(model, "IfcDoor", "PredefinedType")
+        self._all: Optional[List[DoorData]] = None
+        self._soa: Optional[Dict[str, np.ndarray]] = None
+        self._by_storey: Dict[Optional[str], List[DoorData]] = defaultdict(list)
+        self._external: List[DoorData] = []
+        self._fire: List[DoorData] = []
+
+    def _prepare(self) -> None:
+        """Build the lookup maps used by extract() on first use."""
+        # _pset_index is assigned last, so once set every map is ready
+        if self._pset_index is not None:
+            return
+        with self._lock:
+            if self._pset_index is None:
+                self._bboxes = precompute_bounding_boxes(
+                    self.model, self.model.by_type("IfcDoor")
+                )
+                self._storey_map = get_container_map(self.model)
+                self._pset_index = get_pset_index(self.model)
+
+    def _ensure_all(self) -> List[DoorData]:
+        """Extract every door once and bucket them for the filter methods."""
+        if self._all is None:
+            # Rules sharing this extractor may ask from several threads
+            with self._all_lock:
+                if self._all is None:
+                    items = load_or_extract(
+                        self.model,
+                        "doors",
+                        DoorData,
+                        lambda: [self.extract(e) for e in self.model.by_type("IfcDoor")],
+                    )
+                    for d in items:
+                        self._cache.setdefault(d.id, d)
+                        self._by_storey[d.storey].append(d)
+                        if d.is_external:
+                            self._external.append(d)
+                        if d.is_fire_rated:
+                            self._fire.append(d)
+                    self._all = items
+        return self._all
+
+    def as_soa(self) -> Dict[str, np.ndarray]:
+        """
+        Get all doors as a structure of arrays for vectorized checks.
+
+        Missing numeric values are NaN, centroids are (N, 3) arrays and
+        bounding box width/depth are NaN without geometry. Arrays share
+        the order of get_all_doors().
+        """
+        if self._soa is None:
+            items = self._ensure_all()
+            bboxes = np.array(
+                [d.bounding_box.as_tuple() if d.bounding_box else (np.nan,) * 6 for d in items],
+                dtype=np.float64,
+            ).reshape(-1, 6)
+            self._soa = {
+                "id": np.array([d.id for d in items], dtype=np.int64),
+                "overall_width": np.array([d.overall_width for d in items], dtype=np.float64),
+                "clear_width": np.array([d.clear_width for d in items], dtype=np.float64),
+                "is_external": np.array([bool(d.is_external) for d in items], dtype=bool),
+                "is_fire_rated": np.array([d.is_fire_rated for d in items], dtype=bool),
+                "centroid": np.array(
+                    [d.centroid or (np.nan, np.nan, np.nan) for d in items], dtype=np.float64
+                ).reshape(-1, 3),
+                "width": bboxes[:, 3] - bboxes[:, 0],
+                "depth": bboxes[:, 4] - bboxes[:, 1],
+                "name": np.array([d.name for d in items], dtype=object),
+                "door_type": np.array([d.door_type for d in items], dtype=object),
+                "storey": np.array([d.storey for d in items], dtype=object),
+            }
+        return self._soa
 
     def get_all_doors(self) -> List[DoorData]:
         """Get all doors in the model."""
-        doors = self.model.by_type("IfcDoor")
-        return [self.extract(door) for door in doors]
+        return list(self._ensure_all())
 
     def get_external_doors(self) -> List[DoorData]:
         """Get all external doors."""
-        all_doors = self.get_all_doors()
-        return [d for d in all_doors if d.is_external]
+        self._ensure_all()
+        return list(self._external)
 
     def get_fire_doors(self) -> List[DoorData]:
         """Get all fire-rated doors."""
-        all_doors = self.get_all_doors()
-        return [d for d in all_doors if d.is_fire_rated]
+        self._ensure_all()
+        return list(self._fire)
 
     def get_doors_by_storey(self, storey_name: str) -> List[DoorData]:
         """Get all doors on a specific storey."""
-        all_doors = self.get_all_doors()
-        return [d for d in all_doors if d.storey == storey_name]
+        self._ensure_all()
+        return list(self._by_storey.get(storey_name, ()))
 
     def extract(self, door: ifcopenshell.entity_instance) -> DoorData:
         """Extract data from a single IfcDoor."""
@@ -84,15 +172,17 @@ class DoorExtractor:
         if door_id in self._cache:
             return self._cache[door_id]
 
+        self._prepare()
+
         # Get property sets
-        psets = ifcopenshell.util.element.get_psets(door)
+        psets = self._pset_index.get(door_id, {})
 
         # Extract dimensions
-        overall_width = getattr(door, "OverallWidth", None)
-        overall_height = getattr(door, "OverallHeight", None)
+        overall_width = door.OverallWidth
+        overall_height = door.OverallHeight
 
         # Try to get clear width from properties
-        clear_width = get_opening_width(door)
+        clear_width = get_opening_width(door, psets, self._bboxes.get(door_id))
 
         # Check if external
         is_external = False
@@ -107,18 +197,15 @@ class DoorExtractor:
             is_fire_rated = fire_rating is not None and fire_rating != ""
 
         # Get door type
-        door_type = None
-        if hasattr(door, "PredefinedType"):
-            door_type = door.PredefinedType
+        door_type = door.PredefinedType if self._has_predef else None
 
         # Get storey
-        storey = None
-        try:
-            container = ifcopenshell.util.element.get_container(door)
-            if container and container.is_a("IfcBuildingStorey"):
-                storey = container.Name
-        except Exception:
-            pass
+        storey = self._storey_map.get(door_id)
+
+        # Centroid from the precomputed geometry pass when available
+        centroid = self._bboxes.centroid(door_id)
+        if centroid is None:
+            centroid = geometry_cache(self.model).centroid(door)
 
         data = DoorData(
             element=door,
@@ -133,12 +220,12 @@ class DoorExtractor:
             is_external=is_external,
             is_fire_rated=is_fire_rated,
             fire_rating=fire_rating,
-            centroid=get_element_centroid(door),
+            centroid=centroid,
             location=get_element_location(door),
-            bounding_box=get_bounding_box(door),
+            bounding_box=self._bboxes.get(door_id),
             properties=psets,
             storey=storey,
         )
 
-        self._cache[door_id] = data
-        return data
+        # setdefault keeps the first result if two threads race on one element
+        return self._cache.setdefault(door_id, data)
@@ -0,0 +1,83 @@
+"""
+Property set lookups shared by the extractors.
+"""
+
+import threading
+from typing import Dict, Optional
+
+import ifcopenshell
+import ifcopenshell.util.element
+
+
+def _materialize_pset(definition: ifcopenshell.entity_instance) -> Optional[dict]:
+    """Convert an IfcPropertySet/IfcElementQuantity into a plain dict."""
+    try:
+        return ifcopenshell.util.element.get_property_definition(definition)
+    except Exception:
+        return None
+
+
+def build_pset_index(model: ifcopenshell.file) -> Dict[int, Dict[str, dict]]:
+    """
+    Map element ids to their property and quantity sets.
+
+    Each relationship is processed once and its property set is shared by
+    all related objects, instead of walking IsDefinedBy per element.
+    Property sets from the element type are included, and occurrence
+    properties override type properties of the same set one by one, as
+    in ifcopenshell.util.element.get_psets.
+
+    Args:
+        model: IFC model
+
+    Returns:
+        Dictionary mapping element id to property set name to properties
+    """
+    index: Dict[int, Dict[str, dict]] = {}
+
+    for rel in model.by_type("IfcRelDefinesByType"):
+        type_psets = {}
+        for definition in getattr(rel.RelatingType, "HasPropertySets", None) or ():
+            pset = _materialize_pset(definition)
+            if pset is not None:
+                type_psets[definition.Name] = pset
+        if type_psets:
+            for obj in rel.RelatedObjects:
+                # Copied per element, as occurrence properties are merged in
+                psets = index.setdefault(obj.id(), {})
+                for name, pset in type_psets.items():
+                    psets[name] = dict(pset)
+
+    for rel in model.by_type("IfcRelDefinesByProperties"):
+        definitions = rel.RelatingPropertyDefinition
+        # IFC4 allows a set of definitions on a single relationship
+        if not isinstance(definitions, tuple):
+            definitions = (definitions,)
+        for definition in definitions:
+            pset = _materialize_pset(definition)
+            if pset is None:
+                continue
+            for obj in rel.RelatedObjects:
+                index.setdefault(obj.id(), {}).setdefault(definition.Name, {}).update(pset)
+
+    return index
+
+
+_index_lock = threading.Lock()
+
+
+def get_pset_index(model: ifcopenshell.file) -> Dict[int, Dict[str, dict]]:
+    """
+    Get the property set index of a model, building it on first use.
+
+    The index is stored on the model, so all extractors share one
+    instead of each materializing every property set again.
+    """
+    index = getattr(model, "_pset_index", None)
+    if index is None:
+        with _index_lock:
+            index = getattr(model, "_pset_index", None)
+            if index is None:
+                index = build_pset_index(model)
+                model._pset_index = index
+    return index
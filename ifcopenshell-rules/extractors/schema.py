@@ -0,0 +1,28 @@
+"""
+Schema capability probes shared by the extractors.
+"""
+
+import ifcopenshell
+import ifcopenshell.ifcopenshell_wrapper
+
+
+def has_attribute(model: ifcopenshell.file, entity: str, attribute: str) -> bool:
+    """
+    Check once whether an entity type declares an attribute in the model's schema.
+
+    Args:
+        model: IFC model
+        entity: Entity type name (e.g. "IfcDoor")
+        attribute: Attribute name (e.g. "PredefinedType")
+
+    Returns:
+        True if the attribute exists, or if the schema cannot be inspected
+    """
+    try:
+        schema = ifcopenshell.ifcopenshell_wrapper.schema_by_name(
+            getattr(model, "schema_identifier", model.schema)
+        )
+        declaration = schema.declaration_by_name(entity)
+        return any(a.name() == attribute for a in declaration.all_attributes())
+    except Exception:
+        return True
@@ -2,17 +2,24 @@
 IfcSpace extraction utilities.
 """
 
+import re
+import threading
+from collections import defaultdict
 from dataclasses import dataclass, field
 from typing import Optional, List, Dict, Any
 
 import ifcopenshell
-import ifcopenshell.util.element
+import numpy as np
 
-from geometry.clearance import get_bounding_box, BoundingBox
-from geometry.distance import get_element_centroid
+from geometry.clearance import precompute_bounding_boxes, BoundingBox, BoundingBoxArray
+from geometry.cache import geometry_cache
+from ._cache import load_or_extract
+from .psets import get_pset_index
+from .schema import has_attribute
+from .spatial import get_container_map
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SpaceData:
     """Extracted data from an IfcSpace."""
 
@@ -46,26 +53,98 @@ class SpaceData:
 class SpaceExtractor:
     """Extracts and caches IfcSpace data from IFC models."""
 
+    # Space types/names that are not rooms
+    _EXCLUDE_RE = re.compile(r"corridor|stair|elevator|shaft|toilet", re.IGNORECASE)
+
     def __init__(self, model: ifcopenshell.file):
         self.model = model
         self._cache: Dict[int, SpaceData] = {}
+        self._bboxes: Optional[BoundingBoxArray] = None
+        self._storey_map: Optional[Dict[int, Optional[str]]] = None
+        self._pset_index: Optional[Dict[int, Dict[str, dict]]] = None
+        self._lock = threading.Lock()
+        self._all_lock = threading.Lock()
+        self._has_predef = has_attribute(model, "IfcSpace", "PredefinedType")
+        self._all: Optional[List[SpaceData]] = None
+        self._soa: Optional[Dict[str, np.ndarray]] = None
+        self._by_storey: Dict[Optional[str], List[SpaceData]] = defaultdict(list)
+
+    def _prepare(self) -> None:
+        """Build the lookup maps used by extract() on first use."""
+        # _pset_index is assigned last, so once set every map is ready
+        if self._pset_index is not None:
+            return
+        with self._lock:
+            if self._pset_index is None:
+                self._bboxes = precompute_bounding_boxes(
+                    self.model, self.model.by_type("IfcSpace")
+                )
+                self._storey_map = get_container_map(self.model)
+                self._pset_index = get_pset_index(self.model)
+
+    def _ensure_all(self) -> List[SpaceData]:
+        """Extract every space once and bucket them by storey."""
+        if self._all is None:
+            # Rules sharing this extractor may ask from several threads
+            with self._all_lock:
+                if self._all is None:
+                    items = load_or_extract(
+                        self.model,
+                        "spaces",
+                        SpaceData,
+                        lambda: [self.extract(e) for e in self.model.by_type("IfcSpace")],
+                    )
+                    for s in items:
+                        self._cache.setdefault(s.id, s)
+                        self._by_storey[s.storey].append(s)
+                    self._all = items
+        return self._all
+
+    def as_soa(self) -> Dict[str, np.ndarray]:
+        """
+        Get all spaces as a structure of arrays for vectorized checks.
+
+        Missing numeric values are NaN, centroids are (N, 3) arrays and
+        bounding box width/depth are NaN without geometry. Arrays share
+        the order of get_all_spaces().
+        """
+        if self._soa is None:
+            items = self._ensure_all()
+            bboxes = np.array(
+                [s.bounding_box.as_tuple() if s.bounding_box else (np.nan,) * 6 for s in items],
+                dtype=np.float64,
+            ).reshape(-1, 6)
+            self._soa = {
+                "id": np.array([s.id for s in items], dtype=np.int64),
+                "floor_area": np.array([s.floor_area for s in items], dtype=np.float64),
+                "height": np.array([s.height for s in items], dtype=np.float64),
+                "centroid": np.array(
+                    [s.centroid or (np.nan, np.nan, np.nan) for s in items], dtype=np.float64
+                ).reshape(-1, 3),
+                "width": bboxes[:, 3] - bboxes[:, 0],
+                "depth": bboxes[:, 4] - bboxes[:, 1],
+                "name": np.array([s.name for s in items], dtype=object),
+                "long_name": np.array([s.long_name for s in items], dtype=object),
+                "space_type": np.array([s.space_type for s in items], dtype=object),
+                "storey": np.array([s.storey for s in items], dtype=object),
+            }
+        return self._soa
 
     def get_all_spaces(self) -> List[SpaceData]:
         """Get all spaces in the model."""
-        spaces = self.model.by_type("IfcSpace")
-        return [self.extract(space) for space in spaces]
+        return list(self._ensure_all())
 
     def get_spaces_by_storey(self, storey_name: str) -> List[SpaceData]:
         """Get all spaces on a specific storey."""
-        all_spaces = self.get_all_spaces()
-        return [s for s in all_spaces if s.storey == storey_name]
+        self._ensure_all()
+        return list(self._by_storey.get(storey_name, ()))
 
     def get_spaces_by_type(self, space_type: str) -> List[SpaceData]:
         """Get spaces of a specific type (e.g., 'CORRIDOR', 'OFFICE')."""
-        all_spaces = self.get_all_spaces()
+        space_type = space_type.lower()
         return [
-            s for s in all_spaces
-            if s.space_type and space_type.lower() in s.space_type.lower()
+            s for s in self._ensure_all()
+            if s.space_type and space_type in s.space_type.lower()
         ]
 
     def extract(self, space: ifcopenshell.entity_instance) -> SpaceData:
@@ -75,8 +154,10 @@ class SpaceExtractor:
         if space_id in self._cache:
             return self._cache[space_id]
 
+        self._prepare()
+
         # Get property sets
-        psets = ifcopenshell.util.element.get_psets(space)
+        psets = self._pset_index.get(space_id, {})
 
         # Extract floor area
         floor_area = None
@@ -91,38 +172,35 @@ class SpaceExtractor:
             height = psets["Qto_SpaceBaseQuantities"].get("Height")
 
         # Get storey
-        storey = None
-        try:
-            container = ifcopenshell.util.element.get_container(space)
-            if container and container.is_a("IfcBuildingStorey"):
-                storey = container.Name
-        except Exception:
-            pass
+        storey = self._storey_map.get(space_id)
 
         # Get space type from PredefinedType or properties
-        space_type = None
-        if hasattr(space, "PredefinedType"):
-            space_type = space.PredefinedType
+        space_type = space.PredefinedType if self._has_predef else None
         if space_type is None and "Pset_SpaceCommon" in psets:
             space_type = psets["Pset_SpaceCommon"].get("Category")
 
+        # Centroid from the precomputed geometry pass when available
+        centroid = self._bboxes.centroid(space_id)
+        if centroid is None:
+            centroid = geometry_cache(self.model).centroid(space)
+
         data = SpaceData(
             element=space,
             id=space_id,
             global_id=space.GlobalId,
             name=space.Name,
-            long_name=getattr(space, "LongName", None),
+            long_name=space.LongName,
             space_type=space_type,
             floor_area=floor_area,
             height=height,
-            centroid=get_element_centroid(space),
-            bounding_box=get_bounding_box(space),
+            centroid=centroid,
+            bounding_box=self._bboxes.get(space_id),
             properties=psets,
             storey=storey,
         )
 
-        self._cache[space_id] = data
-        return data
+        # setdefault keeps the first result if two threads race on one element
+        return self._cache.setdefault(space_id, data)
 
     def get_corridors(self) -> List[SpaceData]:
         """Get all corridor spaces."""
@@ -130,12 +208,8 @@ class SpaceExtractor:
 
     def get_rooms(self) -> List[SpaceData]:
         """Get all room spaces (excluding corridors, stairs, etc.)."""
-        all_spaces = self.get_all_spaces()
-        exclude_types = ["corridor", "stair", "elevator", "shaft", "toilet"]
+        # Join with a null byte so a match cannot span both fields
         return [
-            s for s in all_spaces
-            if not any(
-                t in (s.space_type or "").lower() or t in (s.name or "").lower()
-                for t in exclude_types
-            )
+            s for s in self._ensure_all()
+            if not self._EXCLUDE_RE.search((s.space_type or "") + "\0" + (s.name or ""))
         ]
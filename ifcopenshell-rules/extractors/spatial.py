@@ -0,0 +1,80 @@
+"""
+Spatial containment lookups shared by the extractors.
+"""
+
+import threading
+from typing import Dict, Optional
+
+import ifcopenshell
+
+
+def build_container_map(model: ifcopenshell.file) -> Dict[int, Optional[str]]:
+    """
+    Map element ids to the name of their containing building storey.
+
+    Walks IfcRelContainedInSpatialStructure and IfcRelAggregates once
+    instead of resolving the container of every element separately.
+    Parts of an aggregate inherit the container of their whole through
+    any number of levels, as in ifcopenshell.util.element.get_container.
+
+    Args:
+        model: IFC model
+
+    Returns:
+        Dictionary of element id to storey name (None if not in a storey)
+    """
+    direct: Dict[int, Optional[str]] = {}
+    for rel in model.by_type("IfcRelContainedInSpatialStructure"):
+        container = rel.RelatingStructure
+        name = container.Name if container.is_a("IfcBuildingStorey") else None
+        for obj in rel.RelatedElements:
+            direct[obj.id()] = name
+
+    whole_of: Dict[int, int] = {}
+    for rel in model.by_type("IfcRelAggregates"):
+        whole_id = rel.RelatingObject.id()
+        for part in rel.RelatedObjects:
+            whole_of[part.id()] = whole_id
+
+    out: Dict[int, Optional[str]] = {}
+    for element_id in (*direct, *whole_of):
+        # Climb to the outermost whole, memoizing every element on the way
+        chain = []
+        name = None
+        while True:
+            if element_id in out:
+                name = out[element_id]
+                break
+            chain.append(element_id)
+            whole_id = whole_of.get(element_id)
+            if whole_id is None:
+                name = direct.get(element_id)
+                break
+            if whole_id in chain:
+                # Cyclic aggregation in a malformed file
+                break
+            element_id = whole_id
+        for chained_id in chain:
+            out[chained_id] = name
+
+    return out
+
+
+_map_lock = threading.Lock()
+
+
+def get_container_map(model: ifcopenshell.file) -> Dict[int, Optional[str]]:
+    """
+    Get the storey container map of a model, building it on first use.
+
+    The map is stored on the model, so all extractors share one instead
+    of each walking the containment relationships again.
+    """
+    out = getattr(model, "_container_map", None)
+    if out is None:
+        with _map_lock:
+            out = getattr(model, "_container_map", None)
+            if out is None:
+                out = build_container_map(model)
+                model._container_map = out
+    return out
@@ -2,17 +2,23 @@
 IfcStair extraction utilities.
 """
 
+import threading
+from collections import defaultdict
 from dataclasses import dataclass, field
 from typing import Optional, List, Dict, Any
 
 import ifcopenshell
-import ifcopenshell.util.element
+import numpy as np
 
-from geometry.clearance import get_bounding_box, BoundingBox
-from geometry.distance import get_element_centroid
+from geometry.clearance import precompute_bounding_boxes, BoundingBox, BoundingBoxArray
+from geometry.cache import geometry_cache
+from ._cache import load_or_extract
+from .psets import get_pset_index
+from .schema import has_attribute
+from .spatial import get_container_map
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class StairData:
     """Extracted data from an IfcStair."""
 
@@ -54,16 +60,87 @@ class StairExtractor:
     def __init__(self, model: ifcopenshell.file):
         self.model = model
         self._cache: Dict[int, StairData] = {}
+        self._bboxes: Optional[BoundingBoxArray] = None
+        self._widths: Optional[np.ndarray] = None
+        self._storey_map: Optional[Dict[int, Optional[str]]] = None
+        self._pset_index: Optional[Dict[int, Dict[str, dict]]] = None
+        self._lock = threading.Lock()
+        self._all_lock = threading.Lock()
+        if has_attribute(model, "IfcStair", "PredefinedType"):
+            self._type_attr: Optional[str] = "PredefinedType"
+        elif has_attribute(model, "IfcStair", "ShapeType"):
+            self._type_attr = "ShapeType"
+        else:
+            self._type_attr = None
+        self._all: Optional[List[StairData]] = None
+        self._soa: Optional[Dict[str, np.ndarray]] = None
+        self._by_storey: Dict[Optional[str], List[StairData]] = defaultdict(list)
+
+    def _prepare(self) -> None:
+        """Build the lookup maps used by extract() on first use."""
+        # _pset_index is assigned last, so once set every map is ready
+        if self._pset_index is not None:
+            return
+        with self._lock:
+            if self._pset_index is None:
+                bboxes = precompute_bounding_boxes(
+                    self.model, self.model.by_type("IfcStair")
+                )
+                # Width is typically the smaller horizontal dimension
+                self._widths = np.minimum(bboxes.widths, bboxes.depths)
+                self._bboxes = bboxes
+                self._storey_map = get_container_map(self.model)
+                self._pset_index = get_pset_index(self.model)
+
+    def _ensure_all(self) -> List[StairData]:
+        """Extract every stair once and bucket them by storey."""
+        if self._all is None:
+            # Rules sharing this extractor may ask from several threads
+            with self._all_lock:
+                if self._all is None:
+                    items = load_or_extract(
+                        self.model,
+                        "stairs",
+                        StairData,
+                        lambda: [self.extract(e) for e in self.model.by_type("IfcStair")],
+                    )
+                    for s in items:
+                        self._cache.setdefault(s.id, s)
+                        self._by_storey[s.storey].append(s)
+                    self._all = items
+        return self._all
+
+    def as_soa(self) -> Dict[str, np.ndarray]:
+        """
+        Get all stairs as a structure of arrays for vectorized checks.
+
+        Missing numeric values are NaN and centroids are (N, 3) arrays.
+        Arrays share the order of get_all_stairs().
+        """
+        if self._soa is None:
+            items = self._ensure_all()
+            self._soa = {
+                "id": np.array([s.id for s in items], dtype=np.int64),
+                "riser_height": np.array([s.riser_height for s in items], dtype=np.float64),
+                "tread_length": np.array([s.tread_length for s in items], dtype=np.float64),
+                "stair_width": np.array([s.stair_width for s in items], dtype=np.float64),
+                "is_external": np.array([bool(s.is_external) for s in items], dtype=bool),
+                "centroid": np.array(
+                    [s.centroid or (np.nan, np.nan, np.nan) for s in items], dtype=np.float64
+                ).reshape(-1, 3),
+                "name": np.array([s.name for s in items], dtype=object),
+                "storey": np.array([s.storey for s in items], dtype=object),
+            }
+        return self._soa
 
     def get_all_stairs(self) -> List[StairData]:
         """Get all stairs in the model."""
-        stairs = self.model.by_type("IfcStair")
-        return [self.extract(stair) for stair in stairs]
+        return list(self._ensure_all())
 
     def get_stairs_by_storey(self, storey_name: str) -> List[StairData]:
         """Get all stairs on a specific storey."""
-        all_stairs = self.get_all_stairs()
-        return [s for s in all_stairs if s.storey == storey_name]
+        self._ensure_all()
+        return list(self._by_storey.get(storey_name, ()))
 
     def extract(self, stair: ifcopenshell.entity_instance) -> StairData:
         """Extract data from a single IfcStair."""
@@ -72,8 +149,10 @@ class StairExtractor:
         if stair_id in self._cache:
             return self._cache[stair_id]
 
+        self._prepare()
+
         # Get property sets
-        psets = ifcopenshell.util.element.get_psets(stair)
+        psets = self._pset_index.get(stair_id, {})
 
         # Get stair dimensions from properties
         number_of_risers = None
@@ -94,27 +173,21 @@ class StairExtractor:
             is_external = psets["Pset_StairCommon"].get("IsExternal", False)
 
         # Get stair type
-        stair_type = None
-        if hasattr(stair, "PredefinedType"):
-            stair_type = stair.PredefinedType
-        elif hasattr(stair, "ShapeType"):
-            stair_type = stair.ShapeType
+        stair_type = getattr(stair, self._type_attr) if self._type_attr else None
 
         # Get storey
-        storey = None
-        try:
-            container = ifcopenshell.util.element.get_container(stair)
-            if container and container.is_a("IfcBuildingStorey"):
-                storey = container.Name
-        except Exception:
-            pass
+        storey = self._storey_map.get(stair_id)
 
         # Get width from bounding box
-        bbox = get_bounding_box(stair)
+        bbox = self._bboxes.get(stair_id)
         stair_width = None
         if bbox:
-            # Width is typically the smaller horizontal dimension
-            stair_width = min(bbox.width, bbox.depth)
+            stair_width = float(self._widths[self._bboxes.index_of(stair_id)])
+
+        # Centroid from the precomputed geometry pass when available
+        centroid = self._bboxes.centroid(stair_id)
+        if centroid is None:
+            centroid = geometry_cache(self.model).centroid(stair)
 
         data = StairData(
             element=stair,
@@ -128,14 +201,14 @@ class StairExtractor:
             tread_length=tread_length,
             stair_width=stair_width,
             is_external=is_external,
-            centroid=get_element_centroid(stair),
+            centroid=centroid,
             bounding_box=bbox,
             properties=psets,
             storey=storey,
         )
 
-        self._cache[stair_id] = data
-        return data
+        # setdefault keeps the first result if two threads race on one element
+        return self._cache.setdefault(stair_id, data)
 
 
 class StairFlightExtractor:
@@ -2,17 +2,23 @@
 IfcWall extraction utilities.
 """
 
+import threading
+from collections import defaultdict
 from dataclasses import dataclass, field
 from typing import Optional, List, Dict, Any
 
 import ifcopenshell
-import ifcopenshell.util.element
+import numpy as np
 
-from geometry.clearance import get_bounding_box, BoundingBox
-from geometry.distance import get_element_centroid
+from geometry.clearance import precompute_bounding_boxes, BoundingBox, BoundingBoxArray
+from geometry.cache import geometry_cache
+from ._cache import load_or_extract
+from .psets import get_pset_index
+from .schema import has_attribute
+from .spatial import get_container_map
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class WallData:
     """Extracted data from an IfcWall."""
 
@@ -54,26 +60,115 @@ class WallExtractor:
     def __init__(self, model: ifcopenshell.file):
         self.model = model
         self._cache: Dict[int, WallData] = {}
+        self._bboxes: Optional[BoundingBoxArray] = None
+        self._thicknesses: Optional[np.ndarray] = None
+        self._bbox_lock = threading.Lock()
+        self._storey_map: Optional[Dict[int, Optional[str]]] = None
+        self._pset_index: Optional[Dict[int, Dict[str, dict]]] = None
+        self._lock = threading.Lock()
+        self._all_lock = threading.Lock()
+        self._has_predef = has_attribute(model, "IfcWall", "PredefinedType")
+        self._all: Optional[List[WallData]] = None
+        self._soa: Optional[Dict[str, np.ndarray]] = None
+        self._by_storey: Dict[Optional[str], List[WallData]] = defaultdict(list)
+        self._external: List[WallData] = []
+        self._fire_rated: List[WallData] = []
+
+    def _prepare(self) -> None:
+        """Build the lookup maps used by extract() on first use."""
+        # _pset_index is assigned last, so once set every map is ready
+        if self._pset_index is not None:
+            return
+        with self._lock:
+            if self._pset_index is None:
+                self._storey_map = get_container_map(self.model)
+                self._pset_index = get_pset_index(self.model)
+
+    def _ensure_all(self) -> List[WallData]:
+        """Extract every wall once and bucket them for the filter methods."""
+        if self._all is None:
+            # Rules sharing this extractor may ask from several threads
+            with self._all_lock:
+                if self._all is None:
+                    items = load_or_extract(
+                        self.model,
+                        "walls",
+                        WallData,
+                        lambda: [self.extract(e) for e in self.model.by_type("IfcWall")],
+                    )
+                    for w in items:
+                        self._cache.setdefault(w.id, w)
+                        self._by_storey[w.storey].append(w)
+                        if w.is_external:
+                            self._external.append(w)
+                        if w.fire_rating:
+                            self._fire_rated.append(w)
+                    self._all = items
+        return self._all
+
+    def _ensure_bboxes(self) -> BoundingBoxArray:
+        """
+        Compute bounding boxes and centroids of all walls in one pass.
+
+        Every wall needs a centroid, so walls whose quantities supply all
+        dimensions are included too; leaving them out would cost one
+        create_shape each for the centroid instead.
+        """
+        # _bboxes is assigned last, so once set _thicknesses is ready too
+        if self._bboxes is not None:
+            return self._bboxes
+        with self._bbox_lock:
+            if self._bboxes is None:
+                bboxes = precompute_bounding_boxes(
+                    self.model, self.model.by_type("IfcWall")
+                )
+                # Estimate thickness as minimum horizontal dimension
+                self._thicknesses = np.minimum(bboxes.widths, bboxes.depths)
+                self._bboxes = bboxes
+        return self._bboxes
+
+    def as_soa(self) -> Dict[str, np.ndarray]:
+        """
+        Get all walls as a structure of arrays for vectorized checks.
+
+        Missing numeric values are NaN and centroids are (N, 3) arrays.
+        Arrays share the order of get_all_walls().
+        """
+        if self._soa is None:
+            items = self._ensure_all()
+            self._soa = {
+                "id": np.array([w.id for w in items], dtype=np.int64),
+                "thickness": np.array([w.thickness for w in items], dtype=np.float64),
+                "height": np.array([w.height for w in items], dtype=np.float64),
+                "length": np.array([w.length for w in items], dtype=np.float64),
+                "is_external": np.array([bool(w.is_external) for w in items], dtype=bool),
+                "is_load_bearing": np.array([bool(w.is_load_bearing) for w in items], dtype=bool),
+                "centroid": np.array(
+                    [w.centroid or (np.nan, np.nan, np.nan) for w in items], dtype=np.float64
+                ).reshape(-1, 3),
+                "name": np.array([w.name for w in items], dtype=object),
+                "storey": np.array([w.storey for w in items], dtype=object),
+            }
+        return self._soa
 
     def get_all_walls(self) -> List[WallData]:
         """Get all walls in the model."""
-        walls = self.model.by_type("IfcWall")
-        return [self.extract(wall) for wall in walls]
+        return list(self._ensure_all())
 
     def get_external_walls(self) -> List[WallData]:
         """Get all external walls."""
-        all_walls = self.get_all_walls()
-        return [w for w in all_walls if w.is_external]
+        self._ensure_all()
+        return list(self._external)
 
     def get_fire_rated_walls(self) -> List[WallData]:
         """Get all fire-rated walls."""
-        all_walls = self.get_all_walls()
-        return [w for w in all_walls if w.fire_rating]
+        self._ensure_all()
+        return list(self._fire_rated)
 
     def get_walls_by_storey(self, storey_name: str) -> List[WallData]:
         """Get all walls on a specific storey."""
-        all_walls = self.get_all_walls()
-        return [w for w in all_walls if w.storey == storey_name]
+        self._ensure_all()
+        return list(self._by_storey.get(storey_name, ()))
 
     def extract(self, wall: ifcopenshell.entity_instance) -> WallData:
         """Extract data from a single IfcWall."""
@@ -82,8 +177,10 @@ class WallExtractor:
         if wall_id in self._cache:
             return self._cache[wall_id]
 
+        self._prepare()
+
         # Get property sets
-        psets = ifcopenshell.util.element.get_psets(wall)
+        psets = self._pset_index.get(wall_id, {})
 
         # Check if external
         is_external = False
@@ -111,27 +208,24 @@ class WallExtractor:
             length = quantities.get("Length")
 
         # Get wall type
-        wall_type = None
-        if hasattr(wall, "PredefinedType"):
-            wall_type = wall.PredefinedType
+        wall_type = wall.PredefinedType if self._has_predef else None
 
         # Get storey
-        storey = None
-        try:
-            container = ifcopenshell.util.element.get_container(wall)
-            if container and container.is_a("IfcBuildingStorey"):
-                storey = container.Name
-        except Exception:
-            pass
-
-        # Get bounding box for dimension fallback
-        bbox = get_bounding_box(wall)
+        storey = self._storey_map.get(wall_id)
+
+        # Bounding box from the shared pass, also the dimension fallback
+        bboxes = self._ensure_bboxes()
+        bbox = bboxes.get(wall_id)
         if bbox and thickness is None:
-            # Estimate thickness as minimum horizontal dimension
-            thickness = min(bbox.width, bbox.depth)
+            thickness = float(self._thicknesses[bboxes.index_of(wall_id)])
         if bbox and height is None:
             height = bbox.height
 
+        # Centroid from the precomputed geometry pass when available
+        centroid = bboxes.centroid(wall_id)
+        if centroid is None:
+            centroid = geometry_cache(self.model).centroid(wall)
+
         data = WallData(
             element=wall,
             id=wall_id,
@@ -144,11 +238,11 @@ class WallExtractor:
             thickness=thickness,
             height=height,
             length=length,
-            centroid=get_element_centroid(wall),
+            centroid=centroid,
             bounding_box=bbox,
             properties=psets,
             storey=storey,
         )
 
-        self._cache[wall_id] = data
-        return data
+        # setdefault keeps the first result if two threads race on one element
+        return self._cache.setdefault(wall_id, data)
@@ -2,18 +2,39 @@
 Geometry utilities for IFC rule checking.
 """
 
-from .distance import calculate_distance, get_element_centroid
+from .distance import (
+    calculate_distance,
+    calculate_distance_sq,
+    calculate_distances,
+    get_element_centroid,
+)
 from .area import calculate_area, get_floor_area
-from .clearance import check_clearance, get_bounding_box
-from .path import find_shortest_path, calculate_travel_distance
+from .clearance import (
+    check_clearance,
+    get_bounding_box,
+    BoundingBoxArray,
+    precompute_bounding_boxes,
+    pairwise_clearance,
+)
+from .cache import build_geometry_cache, GeometryCache, geometry_cache
+from .path import find_shortest_path, calculate_travel_distance, travel_distance_batch
 
 __all__ = [
     "calculate_distance",
+    "calculate_distance_sq",
+    "calculate_distances",
     "get_element_centroid",
     "calculate_area",
     "get_floor_area",
     "check_clearance",
     "get_bounding_box",
+    "BoundingBoxArray",
+    "precompute_bounding_boxes",
+    "pairwise_clearance",
+    "build_geometry_cache",
+    "GeometryCache",
+    "geometry_cache",
     "find_shortest_path",
     "calculate_travel_distance",
+    "travel_distance_batch",
 ]
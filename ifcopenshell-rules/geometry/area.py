@@ -5,8 +5,15 @@ Area calculation utilities.
 from typing import Optional
 
 import ifcopenshell
-import ifcopenshell.geom
 import ifcopenshell.util.element
+import numpy as np
+
+
+def _shoelace(xy: np.ndarray) -> float:
+    """Shoelace formula over an (N, 2) vertex array, vectorized over all edges."""
+    x = xy[:, 0]
+    y = xy[:, 1]
+    return abs(float(np.dot(x, np.roll(y, -1)) - np.dot(np.roll(x, -1), y))) / 2.0
 
 
 def calculate_area(vertices: list, is_3d: bool = False) -> float:
@@ -14,8 +21,8 @@ def calculate_area(vertices: list, is_3d: bool = False) -> float:
     Calculate area of a polygon from vertices using the shoelace formula.
 
     Args:
-        vertices: List of (x, y) or (x, y, z) tuples
-        is_3d: If True, project to XY plane first
+        vertices: List or array of (x, y) or (x, y, z) points
+        is_3d: Kept for compatibility; 3D input is detected from its shape
 
     Returns:
         Area in square model units
@@ -23,19 +30,19 @@ def calculate_area(vertices: list, is_3d: bool = False) -> float:
     if len(vertices) < 3:
         return 0.0
 
-    # Use only x, y coordinates
-    if is_3d:
-        vertices = [(v[0], v[1]) for v in vertices]
+    # Use only x, y coordinates; a no-op view for 2D input
+    xy = np.asarray(vertices, dtype=np.float64)[:, :2]
 
-    n = len(vertices)
-    area = 0.0
+    return _shoelace(xy)
 
-    for i in range(n):
-        j = (i + 1) % n
-        area += vertices[i][0] * vertices[j][1]
-        area -= vertices[j][0] * vertices[i][1]
 
-    return abs(area) / 2.0
+# Quantities that usually hold a space's floor area, in priority order
+_AREA_KEYS = (
+    ("Qto_SpaceBaseQuantities", "NetFloorArea"),
+    ("Qto_SpaceBaseQuantities", "GrossFloorArea"),
+    ("BaseQuantities", "NetFloorArea"),
+    ("BaseQuantities", "GrossFloorArea"),
+)
 
 
 def get_floor_area(
@@ -50,9 +57,14 @@ def get_floor_area(
     Returns:
         Floor area in square model units, or None if not available
     """
-    # Try to get from quantities first
+    # Try the known area keys, then scan the quantity sets
     try:
         psets = ifcopenshell.util.element.get_psets(space)
+        for pset_name, key in _AREA_KEYS:
+            value = psets.get(pset_name, {}).get(key)
+            if isinstance(value, (int, float)):
+                return float(value)
+
         for pset_name, pset_data in psets.items():
             if "Area" in pset_name or "Quantities" in pset_name:
                 for key, value in pset_data.items():
@@ -61,15 +73,9 @@ def get_floor_area(
     except Exception:
         pass
 
-    # Fallback: try to compute from geometry
-    try:
-        settings = ifcopenshell.geom.settings()
-        shape = ifcopenshell.geom.create_shape(settings, space)
-        # This is a simplified approach - proper area calculation
-        # would require analyzing the floor polygon
-        return None
-    except Exception:
-        return None
+    # Computing the area from geometry would require analyzing the floor
+    # polygon, so there is no geometry fallback yet
+    return None
 
 
 def get_space_net_area(space: ifcopenshell.entity_instance) -> Optional[float]:
@@ -0,0 +1,203 @@
+"""
+Geometry shared by all rules checking one model.
+"""
+
+import hashlib
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import ifcopenshell
+import numpy as np
+
+from .clearance import (
+    BoundingBox,
+    BoundingBoxArray,
+    get_bounding_box,
+    precompute_bounding_boxes,
+)
+from .distance import get_element_centroid
+
+# Bump when the stored geometry layout changes to invalidate old files
+GEOMETRY_CACHE_VERSION = 1
+
+
+def file_cache_key(model_path: Path, *salt: object) -> str:
+    """
+    Key identifying one version of an IFC file on disk.
+
+    Args:
+        model_path: Path of the IFC file
+        salt: Extra values that also invalidate the key (e.g. versions)
+
+    Returns:
+        Hex digest of the path, modification time, size and salt
+    """
+    st = os.stat(model_path)
+    parts = [Path(model_path).resolve(), st.st_mtime_ns, st.st_size, *salt]
+    raw = ":".join(str(p) for p in parts)
+    return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+
+def _load_boxes(path: Path) -> Optional[tuple]:
+    """Read (boxes, covered ids) from a cache file, or None."""
+    try:
+        with np.load(path) as data:
+            boxes = BoundingBoxArray.from_extents(
+                data["ids"], data["mins"], data["maxs"], data["centroids"]
+            )
+            return boxes, frozenset(data["covered"].tolist())
+    except Exception:
+        return None
+
+
+def _save_boxes(path: Path, boxes: BoundingBoxArray, covered: frozenset) -> None:
+    """Write boxes and covered ids to a cache file, ignoring failures."""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            np.savez(
+                f,
+                ids=boxes.ids,
+                mins=boxes.mins,
+                maxs=boxes.maxs,
+                centroids=boxes.centroids,
+                covered=np.fromiter(covered, dtype=np.int64),
+            )
+        os.replace(tmp, path)
+    except Exception:
+        pass
+
+
+def build_geometry_cache(
+    model: ifcopenshell.file,
+    types: Iterable[str],
+    model_path: Optional[Path] = None,
+    cache_dir: Optional[Path] = None,
+) -> BoundingBoxArray:
+    """
+    Tessellate the elements used by rules once and share the results.
+
+    Runs one multi-threaded iterator pass and attaches the boxes to the
+    model, where precompute_bounding_boxes and GeometryCache serve later
+    requests from without calling create_shape.
+
+    When model_path and cache_dir are given, the boxes are stored on disk
+    and reused while the IFC file is unchanged.
+
+    Args:
+        model: IFC model
+        types: IFC types to include, e.g. from RuleRegistry.geometry_types
+        model_path: Optional path the model was opened from
+        cache_dir: Optional directory for the on-disk cache
+
+    Returns:
+        BoundingBoxArray of all included elements with geometry
+    """
+    types = tuple(types)
+    elements = [e for t in types for e in model.by_type(t)]
+
+    cache_file = None
+    loaded = None
+    if model_path is not None and cache_dir is not None:
+        key = file_cache_key(model_path, GEOMETRY_CACHE_VERSION, *types)
+        cache_file = Path(cache_dir) / f"{key}.npz"
+        loaded = _load_boxes(cache_file)
+
+    if loaded is not None:
+        cache, covered = loaded
+    else:
+        cache = precompute_bounding_boxes(model, elements)
+        if cache.complete:
+            covered = frozenset(e.id() for e in elements)
+            if cache_file is not None:
+                _save_boxes(cache_file, cache, covered)
+        else:
+            # Leave the rest to per-element fallbacks and keep it off disk
+            covered = frozenset(cache.ids.tolist())
+
+    model._geom_cache = cache
+    model._geom_cache_ids = covered
+
+    return cache
+
+
+class GeometryCache:
+    """
+    Bounding boxes and centroids of one model, memoized by element id.
+
+    Shared by every rule checking the model, so an element's geometry is
+    evaluated at most once per run. Boxes from build_geometry_cache are
+    served without evaluating anything.
+    """
+
+    def __init__(self, model: ifcopenshell.file):
+        self.model = model
+        self._boxes: Dict[int, Optional[BoundingBox]] = {}
+        self._centroids: Dict[int, Optional[Tuple[float, float, float]]] = {}
+
+    def _shared(self, element_id: int) -> Optional[BoundingBoxArray]:
+        """
+        The shared geometry pass if it covered an element, else None.
+
+        Covered elements without geometry are absent from the pass but
+        still covered, so they are not tessellated again.
+        """
+        covered = getattr(self.model, "_geom_cache_ids", frozenset())
+        if element_id in covered:
+            return self.model._geom_cache
+        return None
+
+    def bbox(self, element: ifcopenshell.entity_instance) -> Optional[BoundingBox]:
+        """Get an element's bounding box, or None if it has no geometry."""
+        element_id = element.id()
+        if element_id in self._boxes:
+            return self._boxes[element_id]
+
+        shared = self._shared(element_id)
+        if shared is not None:
+            bbox = shared.get(element_id)
+        else:
+            bbox = get_bounding_box(element)
+
+        # setdefault keeps the first result if two threads race on one element
+        return self._boxes.setdefault(element_id, bbox)
+
+    def centroid(
+        self, element: ifcopenshell.entity_instance
+    ) -> Optional[Tuple[float, float, float]]:
+        """Get an element's vertex centroid, or None if it has no geometry."""
+        element_id = element.id()
+        if element_id in self._centroids:
+            return self._centroids[element_id]
+
+        shared = self._shared(element_id)
+        if shared is not None:
+            centroid = shared.centroid(element_id)
+        else:
+            centroid = get_element_centroid(element)
+
+        return self._centroids.setdefault(element_id, centroid)
+
+    def bboxes(self, elements: List[ifcopenshell.entity_instance]) -> BoundingBoxArray:
+        """Get the bounding boxes of many elements in one geometry pass."""
+        boxes = precompute_bounding_boxes(self.model, elements)
+        for element in elements:
+            element_id = element.id()
+            self._boxes.setdefault(element_id, boxes.get(element_id))
+        return boxes
+
+    def clear(self) -> None:
+        """Forget all boxes, e.g. after the model geometry was edited."""
+        self._boxes.clear()
+        self._centroids.clear()
+
+
+def geometry_cache(model: ifcopenshell.file) -> GeometryCache:
+    """Get the GeometryCache of a model, creating it on first use."""
+    cache = getattr(model, "_geometry_cache", None)
+    if cache is None:
+        cache = GeometryCache(model)
+        model._geometry_cache = cache
+    return cache
@@ -2,15 +2,19 @@
 Clearance and bounding box utilities.
 """
 
+import multiprocessing
 from dataclasses import dataclass
-from typing import Optional, Tuple
+from typing import Iterable, List, Optional, Tuple
 
 import ifcopenshell
 import ifcopenshell.geom
 import numpy as np
 
+from .settings import default_settings
+from .vertices import vertex_array
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class BoundingBox:
     """Axis-aligned bounding box."""
 
@@ -45,6 +49,10 @@ class BoundingBox:
             (self.min_z + self.max_z) / 2,
         )
 
+    def as_tuple(self) -> Tuple[float, float, float, float, float, float]:
+        """Corners as (min_x, min_y, min_z, max_x, max_y, max_z)."""
+        return (self.min_x, self.min_y, self.min_z, self.max_x, self.max_y, self.max_z)
+
     def to_dict(self) -> dict:
         return {
             "min": {"x": self.min_x, "y": self.min_y, "z": self.min_z},
@@ -52,6 +60,146 @@ class BoundingBox:
         }
 
 
+_BBOX_DTYPE = np.dtype([("min", "3f8"), ("max", "3f8")])
+
+
+class BoundingBoxArray:
+    """
+    Bounding boxes of many elements stored in one NumPy record array.
+
+    Derived dimensions are computed for all boxes at once. Single boxes
+    are still available as BoundingBox views through get(). Vertex
+    centroids from the same geometry pass are kept alongside.
+
+    complete is False when the geometry iterator could not be started,
+    so elements may be missing for reasons other than lacking geometry.
+    """
+
+    def __init__(
+        self,
+        ids: Iterable[int] = (),
+        records: Optional[np.ndarray] = None,
+        centroids: Optional[np.ndarray] = None,
+        complete: bool = True,
+    ):
+        self.complete = complete
+        self.ids = np.fromiter(ids, dtype=np.int64)
+        if records is None:
+            records = np.zeros(len(self.ids), dtype=_BBOX_DTYPE)
+        if centroids is None:
+            centroids = np.full((len(self.ids), 3), np.nan)
+        self._arr = records
+        self.centroids = centroids.reshape(-1, 3)
+        self._index = {int(eid): i for i, eid in enumerate(self.ids)}
+
+    def __len__(self) -> int:
+        return len(self._arr)
+
+    @classmethod
+    def from_extents(
+        cls,
+        ids: Iterable[int],
+        mins: np.ndarray,
+        maxs: np.ndarray,
+        centroids: Optional[np.ndarray] = None,
+    ) -> "BoundingBoxArray":
+        """Build an array from (N, 3) min and max corner arrays."""
+        records = np.empty(len(mins), dtype=_BBOX_DTYPE)
+        records["min"] = mins
+        records["max"] = maxs
+        return cls(ids, records, centroids)
+
+    @staticmethod
+    def concatenate(*arrays: "BoundingBoxArray") -> "BoundingBoxArray":
+        """Join several arrays into one."""
+        return BoundingBoxArray(
+            np.concatenate([a.ids for a in arrays]),
+            np.concatenate([a._arr for a in arrays]),
+            np.concatenate([a.centroids for a in arrays]),
+            complete=all(a.complete for a in arrays),
+        )
+
+    def subset(self, element_ids: Iterable[int]) -> "BoundingBoxArray":
+        """Select the rows of the given elements, skipping unknown ids."""
+        rows = [self._index[i] for i in element_ids if i in self._index]
+        return BoundingBoxArray(
+            self.ids[rows], self._arr[rows], self.centroids[rows], complete=self.complete
+        )
+
+    def __contains__(self, element_id: int) -> bool:
+        return element_id in self._index
+
+    def index_of(self, element_id: int) -> Optional[int]:
+        """Row of an element in the arrays, or None if it has no box."""
+        return self._index.get(element_id)
+
+    def get(self, element_id: int, default=None) -> Optional[BoundingBox]:
+        """Get one element's box as a BoundingBox."""
+        i = self._index.get(element_id)
+        if i is None:
+            return default
+        mn, mx = self._arr["min"][i], self._arr["max"][i]
+        return BoundingBox(
+            min_x=float(mn[0]),
+            min_y=float(mn[1]),
+            min_z=float(mn[2]),
+            max_x=float(mx[0]),
+            max_y=float(mx[1]),
+            max_z=float(mx[2]),
+        )
+
+    def centroid(self, element_id: int) -> Optional[Tuple[float, float, float]]:
+        """Get one element's vertex centroid, or None if it has no geometry."""
+        i = self._index.get(element_id)
+        if i is None:
+            return None
+        x, y, z = self.centroids[i].tolist()
+        return (x, y, z)
+
+    @property
+    def mins(self) -> np.ndarray:
+        """(N, 3) array of minimum corners."""
+        return self._arr["min"]
+
+    @property
+    def maxs(self) -> np.ndarray:
+        """(N, 3) array of maximum corners."""
+        return self._arr["max"]
+
+    @property
+    def widths(self) -> np.ndarray:
+        """Widths along X axis."""
+        return self._arr["max"][:, 0] - self._arr["min"][:, 0]
+
+    @property
+    def depths(self) -> np.ndarray:
+        """Depths along Y axis."""
+        return self._arr["max"][:, 1] - self._arr["min"][:, 1]
+
+    @property
+    def heights(self) -> np.ndarray:
+        """Heights along Z axis."""
+        return self._arr["max"][:, 2] - self._arr["min"][:, 2]
+
+    def to_array(self) -> np.ndarray:
+        """(N, 6) array in the bboxes_to_array column layout."""
+        return np.hstack([self._arr["min"], self._arr["max"]])
+
+
+def _bbox_from_vertices(vertices: np.ndarray) -> BoundingBox:
+    """Build a BoundingBox from an (N, 3) vertex array in one reduction pass."""
+    mn = vertices.min(axis=0)
+    mx = vertices.max(axis=0)
+    return BoundingBox(
+        min_x=float(mn[0]),
+        min_y=float(mn[1]),
+        min_z=float(mn[2]),
+        max_x=float(mx[0]),
+        max_y=float(mx[1]),
+        max_z=float(mx[2]),
+    )
+
+
 def get_bounding_box(
     element: ifcopenshell.entity_instance,
     settings: Optional[ifcopenshell.geom.settings] = None,
@@ -59,6 +207,8 @@ def get_bounding_box(
     """
     Get the axis-aligned bounding box of an IFC element.
 
+    Not memoized; use geometry_cache(model).bbox to share boxes across rules.
+
     Args:
         element: IFC element
         settings: Optional geometry settings
@@ -67,23 +217,92 @@ def get_bounding_box(
         BoundingBox or None if geometry cannot be computed
     """
     if settings is None:
-        settings = ifcopenshell.geom.settings()
+        settings = default_settings()
+    return _compute_bounding_box(element, settings)
 
+
+def _compute_bounding_box(
+    element: ifcopenshell.entity_instance,
+    settings: ifcopenshell.geom.settings,
+) -> Optional[BoundingBox]:
+    """Tessellate an element and reduce its vertices to a box."""
     try:
         shape = ifcopenshell.geom.create_shape(settings, element)
-        verts = shape.geometry.verts
-        vertices = np.array(verts).reshape(-1, 3)
+        vertices = vertex_array(shape.geometry.verts)
+        return _bbox_from_vertices(vertices)
+    except Exception:
+        return None
 
-        return BoundingBox(
-            min_x=float(vertices[:, 0].min()),
-            min_y=float(vertices[:, 1].min()),
-            min_z=float(vertices[:, 2].min()),
-            max_x=float(vertices[:, 0].max()),
-            max_y=float(vertices[:, 1].max()),
-            max_z=float(vertices[:, 2].max()),
+
+def precompute_bounding_boxes(
+    model: ifcopenshell.file,
+    element_filter: Optional[List[ifcopenshell.entity_instance]] = None,
+) -> BoundingBoxArray:
+    """
+    Compute bounding boxes for many elements in a single geometry pass.
+
+    Uses the multi-threaded geometry iterator instead of calling
+    create_shape once per element. Vertex centroids are computed in the
+    same pass.
+
+    Args:
+        model: IFC model
+        element_filter: Optional elements to include (all elements if None)
+
+    Returns:
+        BoundingBoxArray keyed by element id
+    """
+    if element_filter is not None and not element_filter:
+        return BoundingBoxArray()
+
+    # Serve elements already covered by a shared model-wide pass
+    shared: Optional[BoundingBoxArray] = getattr(model, "_geom_cache", None)
+    if shared is not None and element_filter is not None:
+        covered = getattr(model, "_geom_cache_ids", frozenset())
+        missing = [e for e in element_filter if e.id() not in covered]
+        hit = shared.subset(e.id() for e in element_filter)
+        if not missing:
+            return hit
+        return BoundingBoxArray.concatenate(hit, _iterate_bounding_boxes(model, missing))
+
+    return _iterate_bounding_boxes(model, element_filter)
+
+
+def _iterate_bounding_boxes(
+    model: ifcopenshell.file,
+    element_filter: Optional[List[ifcopenshell.entity_instance]],
+) -> BoundingBoxArray:
+    """Run the geometry iterator and collect boxes and centroids."""
+    ids: List[int] = []
+    extents: List[Tuple[np.ndarray, np.ndarray]] = []
+    centroids: List[np.ndarray] = []
+    settings = default_settings()
+
+    try:
+        it = ifcopenshell.geom.iterator(
+            settings, model, multiprocessing.cpu_count(), include=element_filter
         )
+        has_shapes = it.initialize()
     except Exception:
-        return None
+        # Iterator could not start; callers fall back to per-element shapes
+        return BoundingBoxArray(complete=False)
+
+    if has_shapes:
+        while True:
+            shape = it.get()
+            vertices = vertex_array(shape.geometry.verts)
+            if len(vertices):
+                ids.append(int(shape.id))
+                extents.append((vertices.min(axis=0), vertices.max(axis=0)))
+                centroids.append(vertices.mean(axis=0))
+            if not it.next():
+                break
+
+    return BoundingBoxArray(
+        ids,
+        np.array(extents, dtype=_BBOX_DTYPE),
+        np.array(centroids, dtype=np.float64),
+    )
 
 
 def check_clearance(
@@ -110,21 +329,70 @@ def check_clearance(
 
     # Calculate minimum distance between bounding boxes
     # This is a simplified check using axis-aligned boxes
-    dx = max(0, max(bbox1.min_x - bbox2.max_x, bbox2.min_x - bbox1.max_x))
-    dy = max(0, max(bbox1.min_y - bbox2.max_y, bbox2.min_y - bbox1.max_y))
-    dz = max(0, max(bbox1.min_z - bbox2.max_z, bbox2.min_z - bbox1.max_z))
+    clearance = float(
+        pairwise_clearance(bboxes_to_array([bbox1]), bboxes_to_array([bbox2]))[0, 0]
+    )
+
+    return (clearance >= min_clearance, clearance)
 
-    clearance = np.sqrt(dx**2 + dy**2 + dz**2)
 
-    return (clearance >= min_clearance, float(clearance))
+def bboxes_to_array(bboxes: Iterable[BoundingBox]) -> np.ndarray:
+    """
+    Stack bounding boxes into an (N, 6) array.
+
+    Columns are [min_x, min_y, min_z, max_x, max_y, max_z].
+    """
+    arr = np.array(
+        [b.as_tuple() for b in bboxes],
+        dtype=np.float64,
+    )
+    return arr.reshape(-1, 6)
 
 
-def get_opening_width(door: ifcopenshell.entity_instance) -> Optional[float]:
+def pairwise_clearance(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Calculate clearance between every pair of bounding boxes.
+
+    Args:
+        a: (N, 6) array from bboxes_to_array
+        b: (M, 6) array from bboxes_to_array
+
+    Returns:
+        (N, M) array of distances between boxes (0 where they overlap)
+    """
+    gaps = np.maximum(
+        0.0,
+        np.maximum(
+            a[:, None, 0:3] - b[None, :, 3:6],
+            b[None, :, 0:3] - a[:, None, 3:6],
+        ),
+    )
+    return np.sqrt((gaps * gaps).sum(axis=-1))
+
+
+# Property set entries that usually hold a door's width, in priority order
+_KNOWN_WIDTH_KEYS = (
+    ("Pset_DoorCommon", "NominalWidth"),
+    ("Qto_DoorBaseQuantities", "Width"),
+    ("Pset_DoorCommon", "Width"),
+)
+
+
+def get_opening_width(
+    door: ifcopenshell.entity_instance,
+    psets: Optional[dict] = None,
+    bbox: Optional[BoundingBox] = None,
+) -> Optional[float]:
     """
     Get the clear opening width of a door.
 
+    Geometry is only evaluated if neither the attributes nor the property
+    sets provide a width.
+
     Args:
         door: IfcDoor element
+        psets: Optional pre-fetched property sets of the door
+        bbox: Optional pre-computed bounding box of the door
 
     Returns:
         Opening width in model units or None
@@ -133,10 +401,16 @@ def get_opening_width(door: ifcopenshell.entity_instance) -> Optional[float]:
     if hasattr(door, "OverallWidth") and door.OverallWidth:
         return float(door.OverallWidth)
 
-    # Try to get from property sets
+    # Try the known width keys, then scan the property sets
     try:
-        import ifcopenshell.util.element
-        psets = ifcopenshell.util.element.get_psets(door)
+        if psets is None:
+            import ifcopenshell.util.element
+            psets = ifcopenshell.util.element.get_psets(door)
+
+        for pset_name, key in _KNOWN_WIDTH_KEYS:
+            value = psets.get(pset_name, {}).get(key)
+            if isinstance(value, (int, float)):
+                return float(value)
 
         for pset_name, pset_data in psets.items():
             for key, value in pset_data.items():
@@ -146,7 +420,8 @@ def get_opening_width(door: ifcopenshell.entity_instance) -> Optional[float]:
         pass
 
     # Fallback to bounding box
-    bbox = get_bounding_box(door)
+    if bbox is None:
+        bbox = get_bounding_box(door)
     if bbox:
         # Assume door width is the smaller of width/depth
         return min(bbox.width, bbox.depth)
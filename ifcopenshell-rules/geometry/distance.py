@@ -9,6 +9,9 @@ import ifcopenshell
 import ifcopenshell.geom
 import numpy as np
 
+from .settings import default_settings
+from .vertices import vertex_array
+
 
 def calculate_distance(
     point1: Tuple[float, float, float],
@@ -24,13 +27,51 @@ def calculate_distance(
     Returns:
         Distance in model units
     """
-    return math.sqrt(
-        (point2[0] - point1[0]) ** 2
-        + (point2[1] - point1[1]) ** 2
-        + (point2[2] - point1[2]) ** 2
+    return math.hypot(
+        point2[0] - point1[0],
+        point2[1] - point1[1],
+        point2[2] - point1[2],
     )
 
 
+def calculate_distance_sq(
+    point1: Tuple[float, float, float],
+    point2: Tuple[float, float, float],
+) -> float:
+    """
+    Calculate squared Euclidean distance between two 3D points.
+
+    Cheaper than calculate_distance when only comparing distances,
+    since the square root preserves ordering.
+
+    Args:
+        point1: First point (x, y, z)
+        point2: Second point (x, y, z)
+
+    Returns:
+        Squared distance in square model units
+    """
+    dx = point2[0] - point1[0]
+    dy = point2[1] - point1[1]
+    dz = point2[2] - point1[2]
+    return dx * dx + dy * dy + dz * dz
+
+
+def calculate_distances(starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """
+    Calculate Euclidean distances between paired 3D points in one pass.
+
+    Args:
+        starts: (N, 3) array of first points
+        ends: (N, 3) array of second points
+
+    Returns:
+        (N,) array of distances in model units
+    """
+    diff = np.asarray(ends, dtype=np.float64) - np.asarray(starts, dtype=np.float64)
+    return np.sqrt((diff * diff).sum(axis=1))
+
+
 def calculate_distance_2d(
     point1: Tuple[float, float],
     point2: Tuple[float, float],
@@ -45,7 +86,7 @@ def calculate_distance_2d(
     Returns:
         Distance in model units
     """
-    return math.sqrt((point2[0] - point1[0]) ** 2 + (point2[1] - point1[1]) ** 2)
+    return math.hypot(point2[0] - point1[0], point2[1] - point1[1])
 
 
 def get_element_centroid(
@@ -55,6 +96,9 @@ def get_element_centroid(
     """
     Get the centroid of an IFC element.
 
+    Not memoized; use geometry_cache(model).centroid to share centroids
+    across rules.
+
     Args:
         element: IFC element
         settings: Optional geometry settings
@@ -63,15 +107,22 @@ def get_element_centroid(
         Centroid coordinates (x, y, z) or None if geometry cannot be computed
     """
     if settings is None:
-        settings = ifcopenshell.geom.settings()
+        settings = default_settings()
+    return _compute_centroid(element, settings)
 
+
+def _compute_centroid(
+    element: ifcopenshell.entity_instance,
+    settings: ifcopenshell.geom.settings,
+) -> Optional[Tuple[float, float, float]]:
+    """Tessellate an element and average its vertices."""
     try:
         shape = ifcopenshell.geom.create_shape(settings, element)
-        verts = shape.geometry.verts
         # Vertices are stored as flat array [x1,y1,z1,x2,y2,z2,...]
-        vertices = np.array(verts).reshape(-1, 3)
-        centroid = vertices.mean(axis=0)
-        return tuple(centroid)
+        vertices = vertex_array(shape.geometry.verts)
+        # Unpack to plain floats so callers avoid NumPy scalar arithmetic
+        x, y, z = (vertices.sum(axis=0) / len(vertices)).tolist()
+        return (x, y, z)
     except Exception:
         return None
 
@@ -2,9 +2,16 @@
 Path and travel distance utilities for egress calculations.
 """
 
-from typing import Optional, Tuple, List
+import math
+from collections import defaultdict
+from typing import Dict, Optional, Tuple, List
 
 import ifcopenshell
+import numpy as np
+
+
+# Paths with more points than this are measured with NumPy
+_VECTORIZE_MIN_POINTS = 8
 
 
 def calculate_travel_distance(
@@ -27,23 +34,43 @@ def calculate_travel_distance(
     Returns:
         Total travel distance in model units
     """
-    import math
-
     points = [start_point]
     if waypoints:
         points.extend(waypoints)
     points.append(end_point)
 
+    # NumPy only pays off once there are enough segments
+    if len(points) > _VECTORIZE_MIN_POINTS:
+        return travel_distance_batch(points)
+
     total_distance = 0.0
     for i in range(len(points) - 1):
         p1, p2 = points[i], points[i + 1]
         # Use 2D distance (horizontal travel)
-        distance = math.sqrt((p2[0] - p1[0]) ** 2 + (p2[1] - p1[1]) ** 2)
-        total_distance += distance
+        total_distance += math.hypot(p2[0] - p1[0], p2[1] - p1[1])
 
     return total_distance
 
 
+def travel_distance_batch(points: np.ndarray) -> float:
+    """
+    Calculate horizontal travel distance along a polyline of points.
+
+    Vectorized equivalent of calculate_travel_distance for long paths.
+
+    Args:
+        points: (N, 3) or (N, 2) array of path points in travel order
+
+    Returns:
+        Total travel distance in model units
+    """
+    xy = np.asarray(points, dtype=np.float64)[:, :2]
+    if len(xy) < 2:
+        return 0.0
+    seg = np.diff(xy, axis=0)
+    return float(np.sqrt((seg * seg).sum(axis=1)).sum())
+
+
 def find_shortest_path(
     model: ifcopenshell.file,
     start_space: ifcopenshell.entity_instance,
@@ -64,9 +91,10 @@ def find_shortest_path(
     Returns:
         Tuple of (distance, path) or None if no path found
     """
-    from .distance import get_element_centroid, calculate_distance
+    from .clearance import precompute_bounding_boxes
+    from .cache import geometry_cache
 
-    start_centroid = get_element_centroid(start_space)
+    start_centroid = geometry_cache(model).centroid(start_space)
     if start_centroid is None:
         return None
 
@@ -75,26 +103,42 @@ def find_shortest_path(
     if not targets:
         return None
 
-    # Find nearest target
-    min_distance = float("inf")
-    nearest_target = None
-
-    for target in targets:
-        target_centroid = get_element_centroid(target)
-        if target_centroid:
-            distance = calculate_distance(start_centroid, target_centroid)
-            if distance < min_distance:
-                min_distance = distance
-                nearest_target = target
-
-    if nearest_target is None:
+    # Target centroids from one geometry pass, then nearest in one reduction
+    target_boxes = precompute_bounding_boxes(model, list(targets))
+    if not len(target_boxes):
         return None
 
+    offsets = target_boxes.centroids - np.asarray(start_centroid, dtype=np.float64)
+    d2 = (offsets * offsets).sum(axis=1)
+    idx = int(np.argmin(d2))
+    min_distance = math.sqrt(d2[idx])
+
     # Return simplified path (direct line)
-    target_centroid = get_element_centroid(nearest_target)
+    x, y, z = target_boxes.centroids[idx].tolist()
+    target_centroid = (x, y, z)
     return (min_distance, [start_centroid, target_centroid])
 
 
+def _boundaries_by_element(
+    model: ifcopenshell.file,
+) -> Dict[int, List[ifcopenshell.entity_instance]]:
+    """
+    Map building element ids to the space boundaries referencing them.
+
+    Built once per model and stored on it, so repeated lookups do not
+    rescan every IfcRelSpaceBoundary.
+    """
+    boundaries = getattr(model, "_boundaries_by_element", None)
+    if boundaries is None:
+        boundaries = defaultdict(list)
+        for boundary in model.by_type("IfcRelSpaceBoundary"):
+            element = boundary.RelatedBuildingElement
+            if element:
+                boundaries[element.id()].append(boundary)
+        model._boundaries_by_element = boundaries
+    return boundaries
+
+
 def get_connected_spaces(
     space: ifcopenshell.entity_instance,
     model: ifcopenshell.file,
@@ -113,16 +157,14 @@ def get_connected_spaces(
 
     # Get space boundaries
     try:
+        boundaries_by_element = _boundaries_by_element(model)
         if hasattr(space, "BoundedBy"):
             for boundary in space.BoundedBy or []:
                 related_element = boundary.RelatedBuildingElement
                 if related_element and related_element.is_a("IfcDoor"):
                     # Find space on other side of door
-                    for other_boundary in model.by_type("IfcRelSpaceBoundary"):
-                        if (
-                            other_boundary.RelatedBuildingElement == related_element
-                            and other_boundary.RelatingSpace != space
-                        ):
+                    for other_boundary in boundaries_by_element.get(related_element.id(), ()):
+                        if other_boundary.RelatingSpace != space:
                             connected.append(other_boundary.RelatingSpace)
     except Exception:
         pass
@@ -0,0 +1,18 @@
+"""
+Shared geometry kernel settings.
+"""
+
+from functools import lru_cache
+
+import ifcopenshell.geom
+
+
+@lru_cache(maxsize=None)
+def default_settings() -> ifcopenshell.geom.settings:
+    """
+    Get the default geometry settings.
+
+    The settings object is created on first use and reused by every
+    geometry utility afterwards.
+    """
+    return ifcopenshell.geom.settings()
@@ -0,0 +1,12 @@
+"""
+Vertex buffer helpers shared by the geometry utilities.
+"""
+
+import numpy as np
+
+
+def vertex_array(verts) -> np.ndarray:
+    """Convert flat geometry vertices [x1,y1,z1,x2,...] to an (N, 3) array."""
+    if isinstance(verts, (bytes, bytearray, memoryview)):
+        return np.frombuffer(verts, dtype=np.float64).reshape(-1, 3)
+    return np.asarray(verts, dtype=np.float64).reshape(-1, 3)
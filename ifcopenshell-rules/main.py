@@ -8,17 +8,24 @@ Validates IFC models against Singapore building codes including:
 - Building Control regulations
 """
 
-import json
 import click
+import orjson
 from pathlib import Path
 from typing import Optional
 
 import ifcopenshell
 
+from extractors import enable_disk_cache
+from geometry import build_geometry_cache
 from rules.registry import RuleRegistry
 from reporters.json_reporter import JSONReporter
 
 
+def count_instances(model: ifcopenshell.file) -> int:
+    """Count rooted elements without wrapping every entity instance."""
+    return len(model.by_type("IfcRoot"))
+
+
 @click.command()
 @click.option(
     "--ifc-path",
@@ -44,6 +51,22 @@ from reporters.json_reporter import JSONReporter
     default="all",
     help="Rule category to check",
 )
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=1,
+    help="Number of rules to check concurrently (default: 1, serial)",
+)
+@click.option(
+    "--compact",
+    is_flag=True,
+    help="Write the report without indentation",
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Do not read or write the element and geometry caches",
+)
 @click.option(
     "--verbose",
     is_flag=True,
@@ -54,6 +77,9 @@ def main(
     config_dir: Path,
     output: Path,
     category: str,
+    workers: int,
+    compact: bool,
+    no_cache: bool,
     verbose: bool,
 ) -> None:
     """
@@ -61,9 +87,11 @@ def main(
     """
     click.echo(f"Loading IFC model: {ifc_path}")
     model = ifcopenshell.open(str(ifc_path))
+    if not no_cache:
+        enable_disk_cache(model, ifc_path, output.parent / ".cache")
 
     click.echo(f"IFC Schema: {model.schema}")
-    click.echo(f"Total elements: {len(list(model))}")
+    click.echo(f"Total elements: {count_instances(model)}")
 
     # Initialize rule registry and load rules
     registry = RuleRegistry(config_dir)
@@ -73,20 +101,25 @@ def main(
     else:
         categories = [category]
 
+    # Tessellate the geometry the selected rules read, once for all of them
+    build_geometry_cache(
+        model,
+        registry.geometry_types(categories),
+        model_path=ifc_path,
+        cache_dir=None if no_cache else output.parent / ".geom_cache",
+    )
+
     click.echo(f"\nRunning rules for categories: {', '.join(categories)}")
 
-    # Execute rules
-    results = []
-    for cat in categories:
-        rules = registry.get_rules_by_category(cat)
-        if verbose:
+    if verbose:
+        for cat in categories:
+            rules = registry.get_rules_by_category(cat)
             click.echo(f"\n  Category: {cat} ({len(rules)} rules)")
-
-        for rule in rules:
-            if verbose:
+            for rule in rules:
                 click.echo(f"    Checking: {rule.name}")
-            result = rule.check(model)
-            results.append(result)
+
+    # Execute rules, sharing extracted elements between them
+    results = registry.run_all(model, categories, workers=workers)
 
     # Generate report
     reporter = JSONReporter()
@@ -97,8 +130,10 @@ def main(
 
     # Write output
     output.parent.mkdir(parents=True, exist_ok=True)
-    with open(output, "w") as f:
-        json.dump(report, f, indent=2)
+    options = orjson.OPT_SERIALIZE_NUMPY
+    if not compact:
+        options |= orjson.OPT_INDENT_2
+    output.write_bytes(orjson.dumps(report, option=options))
 
     # Summary
     passed = sum(1 for r in results if r.passed)
@@ -5,7 +5,7 @@ JSON report generator for compliance results.
 from datetime import datetime
 from typing import List, Optional, Dict, Any
 
-from rules.base import RuleResult
+from rules.base import Location, RuleResult
 
 
 class JSONReporter:
@@ -32,28 +32,32 @@ class JSONReporter:
         Returns:
             Dictionary ready for JSON serialization
         """
-        # Calculate summary statistics
+        # Summarize, categorize and count severities in a single pass
         total_rules = len(results)
-        passed_rules = sum(1 for r in results if r.passed)
-        failed_rules = total_rules - passed_rules
-        total_violations = sum(len(r.violations) for r in results)
-
-        # Categorize results
+        passed_rules = 0
+        total_violations = 0
         results_by_category: Dict[str, List[dict]] = {}
+        severity_counts = {"error": 0, "warning": 0, "info": 0}
+        include_passed = self.include_passed_rules
+
         for result in results:
-            category = result.category
-            if category not in results_by_category:
-                results_by_category[category] = []
+            if result.passed:
+                passed_rules += 1
+            violations = result.violations
+            total_violations += len(violations)
 
-            if self.include_passed_rules or not result.passed:
-                results_by_category[category].append(result.to_dict())
+            category_results = results_by_category.setdefault(result.category, [])
+            if include_passed or not result.passed:
+                category_results.append(result.to_dict())
 
-        # Count violations by severity
-        severity_counts = {"error": 0, "warning": 0, "info": 0}
-        for result in results:
-            for violation in result.violations:
+            for violation in violations:
                 severity = violation.severity
-                severity_counts[severity] = severity_counts.get(severity, 0) + 1
+                if severity in severity_counts:
+                    severity_counts[severity] += 1
+                else:
+                    severity_counts[severity] = 1
+
+        failed_rules = total_rules - passed_rules
 
         report = {
             "report_metadata": {
@@ -91,13 +95,14 @@ class JSONReporter:
             Summary dictionary
         """
         total = len(results)
-        passed = sum(1 for r in results if r.passed)
 
+        # Failed rules are the complement of passed ones, so one pass suffices
         failed_rules = [
             {"rule_id": r.rule_id, "name": r.name, "violations": len(r.violations)}
             for r in results
             if not r.passed
         ]
+        passed = total - len(failed_rules)
 
         return {
             "total_rules": total,
@@ -120,15 +125,16 @@ class JSONReporter:
         Returns:
             List of formatted message strings
         """
-        messages = []
-
-        for v in result.violations:
-            msg = f"[{v.severity.upper()}] {result.rule_id}: {v.message}"
-            if v.element_name:
-                msg += f" (Element: {v.element_name})"
-            if include_location and v.location:
-                loc = v.location
-                msg += f" @ ({loc.get('x', 0):.2f}, {loc.get('y', 0):.2f}, {loc.get('z', 0):.2f})"
-            messages.append(msg)
-
-        return messages
+        rule_id = result.rule_id
+
+        def format_location(loc: Optional[Location]) -> str:
+            if not include_location or not loc:
+                return ""
+            return f" @ ({loc.x:.2f}, {loc.y:.2f}, {loc.z:.2f})"
+
+        return [
+            f"[{v.severity.upper()}] {rule_id}: {v.message}"
+            + (f" (Element: {v.element_name})" if v.element_name else "")
+            + format_location(v.location)
+            for v in result.violations
+        ]
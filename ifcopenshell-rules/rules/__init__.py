@@ -2,7 +2,7 @@
 Rules module - Contains rule implementations for Singapore Code of Practice.
 """
 
-from .base import BaseRule, RuleResult, Violation
+from .base import BaseRule, Location, RuleResult, Violation
 from .registry import RuleRegistry
 
-__all__ = ["BaseRule", "RuleResult", "Violation", "RuleRegistry"]
+__all__ = ["BaseRule", "Location", "RuleResult", "Violation", "RuleRegistry"]
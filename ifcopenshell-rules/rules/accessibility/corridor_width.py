@@ -4,12 +4,22 @@ Corridor Width Rule - BCA Accessibility Code.
 Checks minimum corridor width for wheelchair accessibility.
 """
 
-from typing import List
+import re
+from functools import cached_property
+from typing import List, Optional
 
 import ifcopenshell
+import numpy as np
 
-from rules.base import BaseRule, RuleResult, Violation
-from extractors.spaces import SpaceExtractor
+from rules.base import (
+    BaseRule,
+    Location,
+    RuleResult,
+    Violation,
+    keyword_pattern,
+    to_millimetres,
+)
+from rules.context import RuleContext
 
 
 class CorridorWidthRule(BaseRule):
@@ -20,16 +30,11 @@ class CorridorWidthRule(BaseRule):
 
     RULE_ID = "ACC-001"
     CATEGORY = "accessibility"
+    GEOMETRY_TYPES = ("IfcSpace",)
 
-    def check(self, model: ifcopenshell.file) -> RuleResult:
-        """Check corridor width requirements."""
-        violations: List[Violation] = []
-
-        # Get parameters (in mm)
-        min_width = self.get_param("min_width_mm", 1200)
-        min_width_turning = self.get_param("min_width_turning_mm", 1500)
-
-        # Get corridor identification patterns
+    @cached_property
+    def _corridor_re(self) -> re.Pattern:
+        """Compiled pattern of all space types and names identifying corridors."""
         corridor_config = self.config.get("corridor_identification", {})
         space_types = corridor_config.get(
             "space_types", ["CORRIDOR", "HALLWAY", "PASSAGE"]
@@ -37,57 +42,60 @@ class CorridorWidthRule(BaseRule):
         name_patterns = corridor_config.get(
             "name_patterns", ["corridor", "hallway", "passage"]
         )
+        return keyword_pattern([*space_types, *name_patterns])
+
+    def check(
+        self, model: ifcopenshell.file, context: Optional[RuleContext] = None
+    ) -> RuleResult:
+        """Check corridor width requirements."""
+        violations: List[Violation] = []
+
+        # Get parameters (in mm)
+        min_width = self.get_param("min_width_mm", 1200)
+        min_width_turning = self.get_param("min_width_turning_mm", 1500)
+
+        # Get corridor identification pattern
+        corridor_re = self._corridor_re
 
         # Extract spaces
-        space_extractor = SpaceExtractor(model)
+        space_extractor = self._context(model, context).spaces
         all_spaces = space_extractor.get_all_spaces()
+        soa = space_extractor.as_soa()
+
+        # Find corridors with one search over type, name and long name,
+        # joined with a null byte so a match cannot span two fields
+        is_corridor = np.fromiter(
+            (
+                bool(
+                    corridor_re.search(
+                        "\0".join(
+                            filter(None, (space.space_type, space.name, space.long_name))
+                        )
+                    )
+                )
+                for space in all_spaces
+            ),
+            dtype=bool,
+            count=len(all_spaces),
+        )
+
+        # Width is the smaller horizontal dimension of the bounding box,
+        # NaN for spaces without geometry
+        widths = np.minimum(soa["width"], soa["depth"])
+        # Convert to mm if in meters (heuristic)
+        widths = to_millimetres(widths, metre_below=100)
+
+        checked = is_corridor & ~np.isnan(widths)
+        too_narrow = checked & (widths < min_width)
+        below_turning = checked & ~too_narrow & (widths < min_width_turning)
 
-        # Find corridors
-        corridors = []
-        for space in all_spaces:
-            is_corridor = False
-
-            # Check space type
-            if space.space_type:
-                for st in space_types:
-                    if st.lower() in space.space_type.lower():
-                        is_corridor = True
-                        break
-
-            # Check name
-            if not is_corridor and space.name:
-                for pattern in name_patterns:
-                    if pattern.lower() in space.name.lower():
-                        is_corridor = True
-                        break
-
-            # Check long name
-            if not is_corridor and space.long_name:
-                for pattern in name_patterns:
-                    if pattern.lower() in space.long_name.lower():
-                        is_corridor = True
-                        break
-
-            if is_corridor:
-                corridors.append(space)
-
-        # Check each corridor
-        for corridor in corridors:
-            width = None
-
-            # Try to get width from bounding box
-            if corridor.bounding_box:
-                # Width is the smaller horizontal dimension
-                width = min(corridor.bounding_box.width, corridor.bounding_box.depth)
-                # Convert to mm if in meters (heuristic)
-                if width < 100:
-                    width = width * 1000
-
-            if width is None:
-                continue
+        # Build violations only for the failing corridors
+        for i in np.flatnonzero(too_narrow | below_turning):
+            corridor = all_spaces[i]
+            width = float(widths[i])
 
             # Check minimum width
-            if width < min_width:
+            if too_narrow[i]:
                 violations.append(
                     Violation(
                         element_id=corridor.id,
@@ -97,15 +105,7 @@ class CorridorWidthRule(BaseRule):
                             f"Corridor width ({width:.0f}mm) is less than "
                             f"minimum required for accessibility ({min_width}mm)"
                         ),
-                        location=(
-                            {
-                                "x": corridor.centroid[0],
-                                "y": corridor.centroid[1],
-                                "z": corridor.centroid[2],
-                            }
-                            if corridor.centroid
-                            else None
-                        ),
+                        location=Location.from_point(corridor.centroid),
                         severity="error",
                         actual_value=round(width),
                         expected_value=min_width,
@@ -122,15 +122,7 @@ class CorridorWidthRule(BaseRule):
                             f"Corridor width ({width:.0f}mm) is below recommended "
                             f"width for wheelchair turning ({min_width_turning}mm)"
                         ),
-                        location=(
-                            {
-                                "x": corridor.centroid[0],
-                                "y": corridor.centroid[1],
-                                "z": corridor.centroid[2],
-                            }
-                            if corridor.centroid
-                            else None
-                        ),
+                        location=Location.from_point(corridor.centroid),
                         severity="warning",
                         actual_value=round(width),
                         expected_value=min_width_turning,
@@ -4,12 +4,20 @@ Door Clearance Rule - BCA Accessibility Code.
 Checks minimum clear opening width for doors.
 """
 
-from typing import List
+from typing import List, Optional
 
 import ifcopenshell
+import numpy as np
 
-from rules.base import BaseRule, RuleResult, Violation
-from extractors.doors import DoorExtractor
+from rules.base import (
+    BaseRule,
+    Location,
+    RuleResult,
+    Violation,
+    keyword_pattern,
+    to_millimetres,
+)
+from rules.context import RuleContext
 
 
 class DoorClearanceRule(BaseRule):
@@ -20,8 +28,15 @@ class DoorClearanceRule(BaseRule):
 
     RULE_ID = "ACC-002"
     CATEGORY = "accessibility"
+    GEOMETRY_TYPES = ("IfcDoor",)
 
-    def check(self, model: ifcopenshell.file) -> RuleResult:
+    # Name keywords marking a main entrance door
+    ENTRANCE_KEYWORDS = ("main", "entrance", "entry", "lobby")
+    _ENTRANCE_RE = keyword_pattern(ENTRANCE_KEYWORDS)
+
+    def check(
+        self, model: ifcopenshell.file, context: Optional[RuleContext] = None
+    ) -> RuleResult:
         """Check door clearance requirements."""
         violations: List[Violation] = []
 
@@ -30,70 +45,67 @@ class DoorClearanceRule(BaseRule):
         min_main_entrance_width = self.get_param("min_main_entrance_width_mm", 900)
 
         # Get excluded door types
-        exclude_types = self.config.get("exclude_door_types", ["TRAPDOOR", "GATE"])
+        exclude_types = set(self.config.get("exclude_door_types", ["TRAPDOOR", "GATE"]))
 
         # Extract doors
-        door_extractor = DoorExtractor(model)
+        door_extractor = self._context(model, context).doors
         doors = door_extractor.get_all_doors()
+        soa = door_extractor.as_soa()
 
-        for door in doors:
-            # Skip excluded types
-            if door.door_type and door.door_type.upper() in exclude_types:
-                continue
-
-            # Get door clear width
-            width = door.clear_width or door.overall_width
-
-            if width is None:
-                # Try to estimate from bounding box
-                if door.bounding_box:
-                    width = min(door.bounding_box.width, door.bounding_box.depth)
-                    # Convert to mm if in meters
-                    if width < 10:
-                        width = width * 1000
-
-            if width is None:
-                continue
-
-            # Determine required width
-            # Main entrance doors need wider opening
-            is_main_entrance = False
-            if door.name:
-                entrance_keywords = ["main", "entrance", "entry", "lobby"]
-                is_main_entrance = any(
-                    kw in door.name.lower() for kw in entrance_keywords
-                )
+        # Skip excluded types
+        excluded = np.fromiter(
+            (bool(t) and t.upper() in exclude_types for t in soa["door_type"]),
+            dtype=bool,
+            count=len(doors),
+        )
+
+        # Get door clear width, falling back to overall width when unset or zero
+        clear = soa["clear_width"]
+        widths = np.where(np.isnan(clear) | (clear == 0), soa["overall_width"], clear)
+
+        # Try to estimate the rest from bounding box
+        bbox_widths = np.minimum(soa["width"], soa["depth"])
+        # Convert to mm if in meters
+        bbox_widths = to_millimetres(bbox_widths, metre_below=10)
+        widths = np.where(np.isnan(widths), bbox_widths, widths)
+
+        # Determine required width
+        # Main entrance doors need wider opening
+        is_main_entrance = np.fromiter(
+            (bool(name) and bool(self._ENTRANCE_RE.search(name)) for name in soa["name"]),
+            dtype=bool,
+            count=len(doors),
+        )
+        required_widths = np.where(
+            is_main_entrance, min_main_entrance_width, min_clear_width
+        )
 
+        # Check width, building violations only for failing doors
+        failing = ~excluded & ~np.isnan(widths) & (widths < required_widths)
+
+        for i in np.flatnonzero(failing):
+            door = doors[i]
+            width = float(widths[i])
             required_width = (
-                min_main_entrance_width if is_main_entrance else min_clear_width
+                min_main_entrance_width if is_main_entrance[i] else min_clear_width
             )
 
-            # Check width
-            if width < required_width:
-                door_desc = "Main entrance door" if is_main_entrance else "Door"
-                violations.append(
-                    Violation(
-                        element_id=door.id,
-                        element_type="IfcDoor",
-                        element_name=door.name,
-                        message=(
-                            f"{door_desc} clear width ({width:.0f}mm) is less than "
-                            f"minimum required for accessibility ({required_width}mm)"
-                        ),
-                        location=(
-                            {
-                                "x": door.centroid[0],
-                                "y": door.centroid[1],
-                                "z": door.centroid[2],
-                            }
-                            if door.centroid
-                            else None
-                        ),
-                        severity="error",
-                        actual_value=round(width),
-                        expected_value=required_width,
-                    )
+            door_desc = "Main entrance door" if is_main_entrance[i] else "Door"
+            violations.append(
+                Violation(
+                    element_id=door.id,
+                    element_type="IfcDoor",
+                    element_name=door.name,
+                    message=(
+                        f"{door_desc} clear width ({width:.0f}mm) is less than "
+                        f"minimum required for accessibility ({required_width}mm)"
+                    ),
+                    location=Location.from_point(door.centroid),
+                    severity="error",
+                    actual_value=round(width),
+                    expected_value=required_width,
                 )
+            )
 
         return self._create_result(
             passed=len(violations) == 0,
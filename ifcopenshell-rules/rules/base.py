@@ -2,16 +2,81 @@
 Base classes for rule definitions.
 """
 
+import copy
+import re
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Any, Optional
+from functools import lru_cache
+from typing import Any, Iterable, Optional
 from pathlib import Path
 
-import yaml
 import ifcopenshell
+import numpy as np
 
+from .context import RuleContext
 
-@dataclass
+
+def keyword_pattern(keywords: Iterable[str]) -> re.Pattern:
+    """
+    Compile keywords into one case-insensitive pattern.
+
+    A single search finds any keyword in one scan of the text, instead of
+    one substring test per keyword. Keywords differing only in case are
+    merged. An empty keyword list never matches.
+    """
+    unique = dict.fromkeys(k.casefold() for k in keywords)
+    alternatives = "|".join(re.escape(k) for k in unique)
+    return re.compile(alternatives or r"(?!)", re.IGNORECASE)
+
+
+def to_millimetres(values: np.ndarray, metre_below: float) -> np.ndarray:
+    """
+    Scale lengths that look like metres to millimetres.
+
+    Values below metre_below are assumed to be in metres (heuristic).
+    The scale factor is selected per element and applied in one multiply,
+    without branching on each value. NaN stays NaN.
+    """
+    return values * np.where(values < metre_below, 1000.0, 1.0)
+
+
+@lru_cache(maxsize=None)
+def _load_yaml(path: str, mtime_ns: int) -> Any:
+    """
+    Parse a YAML file once per version on disk.
+
+    The modification time is part of the cache key, so an edited file is
+    parsed again. Uses the libyaml C loader when available.
+    """
+    # Deferred to the first config parse; nothing else in the rules needs yaml
+    import yaml
+
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    with open(path, "r") as f:
+        return yaml.load(f, Loader=loader)
+
+
+@dataclass(slots=True, frozen=True)
+class Location:
+    """Model coordinates of a violation."""
+
+    x: float
+    y: float
+    z: float
+
+    @classmethod
+    def from_point(cls, point: Optional[tuple]) -> Optional["Location"]:
+        """Create from an (x, y, z) point, or None without a point."""
+        if point is None:
+            return None
+        x, y, z = point
+        return cls(x, y, z)
+
+    def to_dict(self) -> dict:
+        return {"x": self.x, "y": self.y, "z": self.z}
+
+
+@dataclass(slots=True, frozen=True)
 class Violation:
     """Represents a single rule violation."""
 
@@ -19,7 +84,7 @@ class Violation:
     element_type: str
     element_name: Optional[str]
     message: str
-    location: Optional[dict] = None  # {"x": float, "y": float, "z": float}
+    location: Optional[Location] = None
     severity: str = "error"  # error, warning, info
     actual_value: Optional[Any] = None
     expected_value: Optional[Any] = None
@@ -30,14 +95,14 @@ class Violation:
             "element_type": self.element_type,
             "element_name": self.element_name,
             "message": self.message,
-            "location": self.location,
+            "location": self.location.to_dict() if self.location else None,
             "severity": self.severity,
             "actual_value": self.actual_value,
             "expected_value": self.expected_value,
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class RuleResult:
     """Result of a rule check."""
 
@@ -73,6 +138,8 @@ class BaseRule(ABC):
     # Override in subclasses
     RULE_ID: str = ""
     CATEGORY: str = ""
+    # IFC types whose geometry the rule reads, tessellated up front
+    GEOMETRY_TYPES: tuple[str, ...] = ()
 
     def __init__(self, config_path: Optional[Path] = None):
         self.config: dict = {}
@@ -85,8 +152,9 @@ class BaseRule(ABC):
 
     def load_config(self, config_path: Path) -> None:
         """Load rule configuration from YAML file."""
-        with open(config_path, "r") as f:
-            self.config = yaml.safe_load(f)
+        parsed = _load_yaml(str(config_path), config_path.stat().st_mtime_ns)
+        # Copy so one rule cannot change the config seen by another
+        self.config = copy.deepcopy(parsed)
 
         self.name = self.config.get("name", self.__class__.__name__)
         self.reference = self.config.get("reference", "")
@@ -97,18 +165,28 @@ class BaseRule(ABC):
         return self.parameters.get(key, default)
 
     @abstractmethod
-    def check(self, model: ifcopenshell.file) -> RuleResult:
+    def check(
+        self, model: ifcopenshell.file, context: Optional[RuleContext] = None
+    ) -> RuleResult:
         """
         Execute the rule check against an IFC model.
 
         Args:
             model: The IFC model to check
+            context: Extractors shared with other rules (created if None)
 
         Returns:
             RuleResult containing pass/fail status and any violations
         """
         pass
 
+    @staticmethod
+    def _context(
+        model: ifcopenshell.file, context: Optional[RuleContext]
+    ) -> RuleContext:
+        """Get the given context, or the model's shared one."""
+        return context if context is not None else RuleContext.for_model(model)
+
     def _create_result(
         self, passed: bool, violations: list[Violation] = None
     ) -> RuleResult:
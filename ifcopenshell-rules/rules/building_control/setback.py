@@ -4,13 +4,21 @@ Setback Rule - URA Development Control Guidelines.
 Checks building setback from property boundaries.
 """
 
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional
 
 import ifcopenshell
+import ifcopenshell.geom
 import ifcopenshell.util.element
+import numpy as np
+import shapely
+from shapely.geometry import MultiPoint, Polygon
+from shapely.geometry.polygon import orient
+from shapely.strtree import STRtree
 
 from rules.base import BaseRule, RuleResult, Violation
-from geometry.clearance import get_bounding_box
+from rules.context import RuleContext
+from geometry.settings import default_settings
+from geometry.vertices import vertex_array
 
 
 class SetbackRule(BaseRule):
@@ -21,8 +29,16 @@ class SetbackRule(BaseRule):
 
     RULE_ID = "BC-001"
     CATEGORY = "building_control"
+    # The site outline is read from its own shape, not the shared pass
+    GEOMETRY_TYPES = ("IfcWall",)
 
-    def check(self, model: ifcopenshell.file) -> RuleResult:
+    # Site sides as returned by _get_setbacks, with their message labels
+    _SIDES = ("front", "rear", "left", "right")
+    _SIDE_LABELS = ("Front", "Rear", "Left side", "Right side")
+
+    def check(
+        self, model: ifcopenshell.file, context: Optional[RuleContext] = None
+    ) -> RuleResult:
         """Check setback requirements."""
         violations: List[Violation] = []
 
@@ -31,8 +47,11 @@ class SetbackRule(BaseRule):
         side_setback = self.get_param("side_setback_m", 3.0)
         rear_setback = self.get_param("rear_setback_m", 3.0)
 
+        # Instances are listed once per model and shared with other rules
+        context = self._context(model, context)
+
         # Get site information
-        sites = model.by_type("IfcSite")
+        sites = context.by_type("IfcSite")
         if not sites:
             # Cannot check without site information
             result = self._create_result(passed=True, violations=[])
@@ -41,119 +60,63 @@ class SetbackRule(BaseRule):
 
         site = sites[0]
 
-        # Try to get site boundary
-        site_boundary = self._get_site_boundary(site, model)
-
-        if site_boundary is None:
+        # Check for a building before evaluating any geometry
+        buildings = context.by_type("IfcBuilding")
+        if not buildings:
             result = self._create_result(passed=True, violations=[])
-            result.metadata["note"] = "Site boundary not defined - setback check skipped"
+            result.metadata["note"] = "No IfcBuilding found - setback check skipped"
             return result
 
-        # Get building bounding box
-        buildings = model.by_type("IfcBuilding")
-        if not buildings:
+        # Try to get site boundary; without it no wall needs to be looked at
+        site_boundary = self._get_site_boundary(site, context)
+
+        if site_boundary is None:
             result = self._create_result(passed=True, violations=[])
-            result.metadata["note"] = "No IfcBuilding found - setback check skipped"
+            result.metadata["note"] = "Site boundary not defined - setback check skipped"
             return result
 
         # Get overall building footprint from external walls
-        external_walls = []
-        for wall in model.by_type("IfcWall"):
-            psets = ifcopenshell.util.element.get_psets(wall)
-            if "Pset_WallCommon" in psets:
-                if psets["Pset_WallCommon"].get("IsExternal", False):
-                    external_walls.append(wall)
+        walls = context.by_type("IfcWall")
+        external_walls = [w for w in walls if self._is_external(w)]
 
         if not external_walls:
             # Use all walls if no external walls marked
-            external_walls = list(model.by_type("IfcWall"))
+            external_walls = list(walls)
 
         if not external_walls:
             result = self._create_result(passed=True, violations=[])
             result.metadata["note"] = "No walls found - setback check skipped"
             return result
 
-        # Calculate building extents
-        building_bounds = self._get_combined_bounds(external_walls)
+        # Wall footprints from one multi-threaded geometry pass
+        wall_bboxes = context.geometry.bboxes(external_walls)
 
-        if building_bounds is None:
+        if not len(wall_bboxes):
             result = self._create_result(passed=True, violations=[])
             result.metadata["note"] = "Could not compute building bounds"
             return result
 
-        # Check setbacks (simplified: compare bounding boxes)
-        min_x, min_y, max_x, max_y = building_bounds
-        site_min_x, site_min_y, site_max_x, site_max_y = site_boundary
+        footprints = shapely.box(
+            wall_bboxes.mins[:, 0],
+            wall_bboxes.mins[:, 1],
+            wall_bboxes.maxs[:, 0],
+            wall_bboxes.maxs[:, 1],
+        )
 
-        # Front setback (assume front is min_y)
-        actual_front = min_y - site_min_y
-        if actual_front < front_setback:
-            violations.append(
-                Violation(
-                    element_id=buildings[0].id(),
-                    element_type="IfcBuilding",
-                    element_name=buildings[0].Name,
-                    message=(
-                        f"Front setback ({actual_front:.2f}m) is less than "
-                        f"required ({front_setback}m)"
-                    ),
-                    severity="error",
-                    actual_value=round(actual_front, 2),
-                    expected_value=front_setback,
-                )
-            )
+        # Measure each site edge to the nearest wall footprint
+        setbacks = self._get_setbacks(site_boundary, footprints)
 
-        # Rear setback (assume rear is max_y)
-        actual_rear = site_max_y - max_y
-        if actual_rear < rear_setback:
-            violations.append(
-                Violation(
-                    element_id=buildings[0].id(),
-                    element_type="IfcBuilding",
-                    element_name=buildings[0].Name,
-                    message=(
-                        f"Rear setback ({actual_rear:.2f}m) is less than "
-                        f"required ({rear_setback}m)"
-                    ),
-                    severity="error",
-                    actual_value=round(actual_rear, 2),
-                    expected_value=rear_setback,
-                )
-            )
+        building = buildings[0]
 
-        # Left side setback
-        actual_left = min_x - site_min_x
-        if actual_left < side_setback:
-            violations.append(
-                Violation(
-                    element_id=buildings[0].id(),
-                    element_type="IfcBuilding",
-                    element_name=buildings[0].Name,
-                    message=(
-                        f"Left side setback ({actual_left:.2f}m) is less than "
-                        f"required ({side_setback}m)"
-                    ),
-                    severity="error",
-                    actual_value=round(actual_left, 2),
-                    expected_value=side_setback,
-                )
-            )
+        # Compare all four sides at once; front faces -y, rear faces +y
+        actual = np.array([setbacks[side] for side in self._SIDES], dtype=np.float64)
+        required = (front_setback, rear_setback, side_setback, side_setback)
+        failing = np.less(actual, np.asarray(required, dtype=np.float64))
 
-        # Right side setback
-        actual_right = site_max_x - max_x
-        if actual_right < side_setback:
+        for i in np.flatnonzero(failing):
             violations.append(
-                Violation(
-                    element_id=buildings[0].id(),
-                    element_type="IfcBuilding",
-                    element_name=buildings[0].Name,
-                    message=(
-                        f"Right side setback ({actual_right:.2f}m) is less than "
-                        f"required ({side_setback}m)"
-                    ),
-                    severity="error",
-                    actual_value=round(actual_right, 2),
-                    expected_value=side_setback,
+                self._setback_violation(
+                    building, self._SIDE_LABELS[i], float(actual[i]), required[i]
                 )
             )
 
@@ -162,18 +125,86 @@ class SetbackRule(BaseRule):
             violations=violations,
         )
 
+    @staticmethod
+    def _setback_violation(
+        building: ifcopenshell.entity_instance,
+        side: str,
+        actual: float,
+        required: float,
+    ) -> Violation:
+        """Create the violation for one side with too small a setback."""
+        return Violation(
+            element_id=building.id(),
+            element_type="IfcBuilding",
+            element_name=building.Name,
+            message=(
+                f"{side} setback ({actual:.2f}m) is less than "
+                f"required ({required}m)"
+            ),
+            severity="error",
+            actual_value=round(actual, 2),
+            expected_value=required,
+        )
+
+    @staticmethod
+    def _find_is_external(definitions) -> Optional[bool]:
+        """Read IsExternal from a Pset_WallCommon among the given definitions."""
+        for definition in definitions:
+            if definition.is_a("IfcPropertySet") and definition.Name == "Pset_WallCommon":
+                for prop in definition.HasProperties or ():
+                    if prop.Name == "IsExternal" and prop.is_a("IfcPropertySingleValue"):
+                        value = prop.NominalValue
+                        return bool(value.wrappedValue) if value is not None else None
+        return None
+
+    @classmethod
+    def _is_external(cls, wall: ifcopenshell.entity_instance) -> bool:
+        """
+        Whether a wall is marked external in Pset_WallCommon.
+
+        Only the IsExternal property is read, instead of materializing
+        every property set of the wall. Occurrence properties override
+        those of the wall type, as in get_psets.
+        """
+        for rel in getattr(wall, "IsDefinedBy", None) or ():
+            if rel.is_a("IfcRelDefinesByProperties"):
+                definitions = rel.RelatingPropertyDefinition
+                # IFC4 allows a set of definitions on a single relationship
+                if not isinstance(definitions, tuple):
+                    definitions = (definitions,)
+                value = cls._find_is_external(definitions)
+                if value is not None:
+                    return value
+
+        wall_type = ifcopenshell.util.element.get_type(wall)
+        if wall_type is not None:
+            value = cls._find_is_external(wall_type.HasPropertySets or ())
+            if value is not None:
+                return value
+
+        return False
+
     def _get_site_boundary(
-        self, site: ifcopenshell.entity_instance, model: ifcopenshell.file
-    ) -> Optional[Tuple[float, float, float, float]]:
+        self, site: ifcopenshell.entity_instance, context: RuleContext
+    ) -> Optional[Polygon]:
         """
-        Get site boundary as (min_x, min_y, max_x, max_y).
+        Get the site boundary as a polygon in plan.
 
-        Returns None if boundary cannot be determined.
+        Uses the convex hull of the site geometry, falling back to its
+        bounding box. Returns None if boundary cannot be determined.
         """
         # Try to get from site geometry
-        bbox = get_bounding_box(site)
-        if bbox:
-            return (bbox.min_x, bbox.min_y, bbox.max_x, bbox.max_y)
+        try:
+            shape = ifcopenshell.geom.create_shape(default_settings(), site)
+            hull = MultiPoint(vertex_array(shape.geometry.verts)[:, :2]).convex_hull
+            if isinstance(hull, Polygon) and hull.area > 0:
+                return hull
+        except Exception:
+            pass
+
+        bbox = context.geometry.bbox(site)
+        if bbox and bbox.width > 0 and bbox.depth > 0:
+            return shapely.box(bbox.min_x, bbox.min_y, bbox.max_x, bbox.max_y)
 
         # Try to get from property sets
         psets = ifcopenshell.util.element.get_psets(site)
@@ -183,27 +214,56 @@ class SetbackRule(BaseRule):
 
         return None
 
-    def _get_combined_bounds(
-        self, elements: List[ifcopenshell.entity_instance]
-    ) -> Optional[Tuple[float, float, float, float]]:
-        """Get combined XY bounds of multiple elements."""
-        min_x = float("inf")
-        min_y = float("inf")
-        max_x = float("-inf")
-        max_y = float("-inf")
-
-        found_any = False
-
-        for element in elements:
-            bbox = get_bounding_box(element)
-            if bbox:
-                found_any = True
-                min_x = min(min_x, bbox.min_x)
-                min_y = min(min_y, bbox.min_y)
-                max_x = max(max_x, bbox.max_x)
-                max_y = max(max_y, bbox.max_y)
-
-        if not found_any:
-            return None
-
-        return (min_x, min_y, max_x, max_y)
+    @classmethod
+    def _get_setbacks(cls, site: Polygon, footprints: np.ndarray) -> Dict[str, float]:
+        """
+        Get the setback from each side of the site to the building.
+
+        Every site edge belongs to the side its outward normal faces and
+        is measured to the nearest footprint part inside the site, found
+        through an STRtree instead of testing every wall. Footprint parts
+        outside the site give the side of their nearest edge a negative
+        setback of their depth past the boundary.
+
+        Args:
+            site: Site boundary polygon
+            footprints: Array of wall footprint polygons
+
+        Returns:
+            Setbacks keyed by "front" (facing -y), "rear" (+y),
+            "left" (-x) and "right" (+x); inf for a side without edges
+        """
+        coords = np.asarray(orient(site, sign=1.0).exterior.coords)
+        starts, ends = coords[:-1], coords[1:]
+        delta = ends - starts
+        keep = np.hypot(delta[:, 0], delta[:, 1]) > 0
+        starts, ends, delta = starts[keep], ends[keep], delta[keep]
+
+        # Outward normals of a counter-clockwise ring point to the right
+        nx, ny = delta[:, 1], -delta[:, 0]
+        edge_side = np.where(
+            np.abs(ny) >= np.abs(nx), np.where(ny < 0, 0, 1), np.where(nx < 0, 2, 3)
+        )
+        edges = shapely.linestrings(np.stack([starts, ends], axis=1))
+        setbacks = np.full(len(cls._SIDES), np.inf)
+
+        inside = shapely.intersection(footprints, site)
+        inside = inside[~shapely.is_empty(inside)]
+        if len(inside):
+            (edge_idx, _), distances = STRtree(inside).query_nearest(
+                edges, return_distance=True, all_matches=False
+            )
+            np.minimum.at(setbacks, edge_side[edge_idx], distances)
+
+        outside = shapely.difference(footprints, site)
+        outside = outside[~shapely.is_empty(outside)]
+        points = shapely.points(shapely.get_coordinates(outside))
+        depths = shapely.distance(site, points)
+        beyond = depths > 0
+        if beyond.any():
+            point_idx, edge_idx = STRtree(edges).query_nearest(
+                points[beyond], all_matches=False
+            )
+            np.minimum.at(setbacks, edge_side[edge_idx], -depths[beyond][point_idx])
+
+        return dict(zip(cls._SIDES, setbacks.tolist()))
@@ -0,0 +1,55 @@
+"""
+Shared state for all rules checking one model.
+"""
+
+import threading
+from typing import Dict, Tuple
+
+import ifcopenshell
+
+from extractors.spaces import SpaceExtractor
+from extractors.doors import DoorExtractor
+from extractors.walls import WallExtractor
+from extractors.stairs import StairExtractor
+from geometry.cache import GeometryCache, geometry_cache
+
+_context_lock = threading.Lock()
+
+
+class RuleContext:
+    """
+    Extractors and geometry shared by every rule checking a model.
+
+    Each element type is extracted at most once per model, however many
+    rules read it. Extraction itself stays lazy, so rules that are not
+    run cost nothing.
+    """
+
+    def __init__(self, model: ifcopenshell.file):
+        self.model = model
+        self.spaces = SpaceExtractor(model)
+        self.doors = DoorExtractor(model)
+        self.walls = WallExtractor(model)
+        self.stairs = StairExtractor(model)
+        self.geometry: GeometryCache = geometry_cache(model)
+        self._by_type: Dict[str, Tuple[ifcopenshell.entity_instance, ...]] = {}
+
+    def by_type(self, ifc_type: str) -> Tuple[ifcopenshell.entity_instance, ...]:
+        """Get all instances of an IFC type, listed once per model."""
+        instances = self._by_type.get(ifc_type)
+        if instances is None:
+            # setdefault keeps the first result if two threads race
+            instances = self._by_type.setdefault(
+                ifc_type, tuple(self.model.by_type(ifc_type))
+            )
+        return instances
+
+    @classmethod
+    def for_model(cls, model: ifcopenshell.file) -> "RuleContext":
+        """Get the context of a model, creating it on first use."""
+        with _context_lock:
+            context = getattr(model, "_rule_context", None)
+            if context is None:
+                context = cls(model)
+                model._rule_context = context
+        return context
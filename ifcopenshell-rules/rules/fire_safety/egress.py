@@ -4,13 +4,13 @@ Egress Width Rule - Singapore Fire Code.
 Checks minimum width requirements for exit doors and corridors.
 """
 
-from typing import List
+from typing import List, Optional
 
 import ifcopenshell
+import numpy as np
 
-from rules.base import BaseRule, RuleResult, Violation
-from extractors.spaces import SpaceExtractor
-from extractors.doors import DoorExtractor
+from rules.base import BaseRule, Location, RuleResult, Violation, to_millimetres
+from rules.context import RuleContext
 
 
 class EgressWidthRule(BaseRule):
@@ -21,8 +21,11 @@ class EgressWidthRule(BaseRule):
 
     RULE_ID = "FS-002"
     CATEGORY = "fire_safety"
+    GEOMETRY_TYPES = ("IfcDoor", "IfcSpace")
 
-    def check(self, model: ifcopenshell.file) -> RuleResult:
+    def check(
+        self, model: ifcopenshell.file, context: Optional[RuleContext] = None
+    ) -> RuleResult:
         """Check egress width requirements."""
         violations: List[Violation] = []
 
@@ -31,85 +34,77 @@ class EgressWidthRule(BaseRule):
         min_corridor_width = self.get_param("min_corridor_width_mm", 1200)
 
         # Check doors
-        door_extractor = DoorExtractor(model)
-        doors = door_extractor.get_all_doors()
-
-        for door in doors:
-            # Get door width (try clear width first, then overall)
-            width = door.clear_width or door.overall_width
-
-            if width is None:
-                # Try to estimate from bounding box
-                if door.bounding_box:
-                    # Width is typically the smaller horizontal dimension
-                    width = min(door.bounding_box.width, door.bounding_box.depth)
-                    # Convert to mm if in meters (heuristic: if < 10, assume meters)
-                    if width < 10:
-                        width = width * 1000
-
-            if width is not None and width < min_door_width:
-                violations.append(
-                    Violation(
-                        element_id=door.id,
-                        element_type="IfcDoor",
-                        element_name=door.name,
-                        message=(
-                            f"Door width ({width:.0f}mm) is less than "
-                            f"minimum required ({min_door_width}mm)"
-                        ),
-                        location=(
-                            {
-                                "x": door.centroid[0],
-                                "y": door.centroid[1],
-                                "z": door.centroid[2],
-                            }
-                            if door.centroid
-                            else None
-                        ),
-                        severity="error",
-                        actual_value=round(width),
-                        expected_value=min_door_width,
-                    )
+        context = self._context(model, context)
+        doors = context.doors.get_all_doors()
+        door_soa = context.doors.as_soa()
+
+        # Get door width (try clear width first, then overall)
+        clear = door_soa["clear_width"]
+        door_widths = np.where(
+            np.isnan(clear) | (clear == 0), door_soa["overall_width"], clear
+        )
+
+        # Try to estimate the rest from bounding box
+        # Width is typically the smaller horizontal dimension
+        bbox_widths = np.minimum(door_soa["width"], door_soa["depth"])
+        # Convert to mm if in meters (heuristic: if < 10, assume meters)
+        bbox_widths = to_millimetres(bbox_widths, metre_below=10)
+        door_widths = np.where(np.isnan(door_widths), bbox_widths, door_widths)
+
+        # Build violations only for the failing doors
+        for i in np.flatnonzero(door_widths < min_door_width):
+            door = doors[i]
+            width = float(door_widths[i])
+            violations.append(
+                Violation(
+                    element_id=door.id,
+                    element_type="IfcDoor",
+                    element_name=door.name,
+                    message=(
+                        f"Door width ({width:.0f}mm) is less than "
+                        f"minimum required ({min_door_width}mm)"
+                    ),
+                    location=Location.from_point(door.centroid),
+                    severity="error",
+                    actual_value=round(width),
+                    expected_value=min_door_width,
                 )
+            )
 
         # Check corridors
-        space_extractor = SpaceExtractor(model)
-        corridors = space_extractor.get_corridors()
-
-        for corridor in corridors:
-            # Get corridor width from bounding box
-            width = None
-            if corridor.bounding_box:
-                # Width is the smaller horizontal dimension
-                width = min(corridor.bounding_box.width, corridor.bounding_box.depth)
-                # Convert to mm if in meters
-                if width < 100:
-                    width = width * 1000
-
-            if width is not None and width < min_corridor_width:
-                violations.append(
-                    Violation(
-                        element_id=corridor.id,
-                        element_type="IfcSpace",
-                        element_name=corridor.name or corridor.long_name,
-                        message=(
-                            f"Corridor width ({width:.0f}mm) is less than "
-                            f"minimum required ({min_corridor_width}mm)"
-                        ),
-                        location=(
-                            {
-                                "x": corridor.centroid[0],
-                                "y": corridor.centroid[1],
-                                "z": corridor.centroid[2],
-                            }
-                            if corridor.centroid
-                            else None
-                        ),
-                        severity="error",
-                        actual_value=round(width),
-                        expected_value=min_corridor_width,
-                    )
+        spaces = context.spaces.get_all_spaces()
+        space_soa = context.spaces.as_soa()
+        is_corridor = np.fromiter(
+            (bool(t) and "corridor" in t.lower() for t in space_soa["space_type"]),
+            dtype=bool,
+            count=len(spaces),
+        )
+
+        # Get corridor width from bounding box
+        # Width is the smaller horizontal dimension
+        corridor_widths = np.minimum(space_soa["width"], space_soa["depth"])
+        # Convert to mm if in meters
+        corridor_widths = to_millimetres(corridor_widths, metre_below=100)
+
+        # Build violations only for the failing corridors
+        for i in np.flatnonzero(is_corridor & (corridor_widths < min_corridor_width)):
+            corridor = spaces[i]
+            width = float(corridor_widths[i])
+            violations.append(
+                Violation(
+                    element_id=corridor.id,
+                    element_type="IfcSpace",
+                    element_name=corridor.name or corridor.long_name,
+                    message=(
+                        f"Corridor width ({width:.0f}mm) is less than "
+                        f"minimum required ({min_corridor_width}mm)"
+                    ),
+                    location=Location.from_point(corridor.centroid),
+                    severity="error",
+                    actual_value=round(width),
+                    expected_value=min_corridor_width,
                 )
+            )
 
         return self._create_result(
             passed=len(violations) == 0,
@@ -4,14 +4,14 @@ Travel Distance Rule - Singapore Fire Code.
 Checks maximum travel distance from any point to nearest exit.
 """
 
-from typing import List
+from typing import List, Optional
 
 import ifcopenshell
+import numpy as np
+from scipy.spatial import cKDTree
 
-from rules.base import BaseRule, RuleResult, Violation
-from extractors.spaces import SpaceExtractor
-from extractors.doors import DoorExtractor
-from geometry.distance import calculate_distance
+from rules.base import BaseRule, Location, RuleResult, Violation
+from rules.context import RuleContext
 
 
 class TravelDistanceRule(BaseRule):
@@ -22,8 +22,11 @@ class TravelDistanceRule(BaseRule):
 
     RULE_ID = "FS-001"
     CATEGORY = "fire_safety"
+    GEOMETRY_TYPES = ("IfcSpace", "IfcDoor")
 
-    def check(self, model: ifcopenshell.file) -> RuleResult:
+    def check(
+        self, model: ifcopenshell.file, context: Optional[RuleContext] = None
+    ) -> RuleResult:
         """Check travel distances for all spaces."""
         violations: List[Violation] = []
 
@@ -39,72 +42,79 @@ class TravelDistanceRule(BaseRule):
         # Convert to model units (assuming meters)
         max_distance_units = max_distance
 
-        # Extract spaces and doors
-        space_extractor = SpaceExtractor(model)
-        door_extractor = DoorExtractor(model)
+        # Extract spaces and doors, shared with the other rules
+        context = self._context(model, context)
+        spaces = context.spaces.get_all_spaces()
+        space_soa = context.spaces.as_soa()
+        door_soa = context.doors.as_soa()
 
-        spaces = space_extractor.get_all_spaces()
-        doors = door_extractor.get_all_doors()
-
-        # Filter to external doors (potential exits)
-        exit_doors = [d for d in doors if d.is_external]
-
-        # If no external doors found, use all doors as potential exits
-        if not exit_doors:
-            exit_doors = doors
-
-        if not exit_doors:
+        if not len(door_soa["id"]):
             # No doors found - cannot check
             return self._create_result(
                 passed=True,
                 violations=[],
             )
 
-        # Get exit door locations
-        exit_locations = []
-        for door in exit_doors:
-            if door.centroid:
-                exit_locations.append((door, door.centroid))
+        # External doors are potential exits; if no external doors found,
+        # use all doors as potential exits
+        is_exit = door_soa["is_external"]
+        if not is_exit.any():
+            is_exit = np.ones_like(is_exit)
 
-        if not exit_locations:
+        # Exit door locations as one (E, 3) array, skipping doors without geometry
+        door_centroids = door_soa["centroid"]
+        exit_arr = door_centroids[is_exit & ~np.isnan(door_centroids).any(axis=1)]
+        if not len(exit_arr):
             return self._create_result(passed=True, violations=[])
 
-        # Check each space
-        for space in spaces:
-            if space.centroid is None:
-                continue
-
-            # Find nearest exit
-            min_distance = float("inf")
-            nearest_exit = None
-
-            for door, exit_loc in exit_locations:
-                distance = calculate_distance(space.centroid, exit_loc)
-                if distance < min_distance:
-                    min_distance = distance
-                    nearest_exit = door
-
-            # Check if distance exceeds maximum
-            if min_distance > max_distance_units:
-                violations.append(
-                    Violation(
-                        element_id=space.id,
-                        element_type="IfcSpace",
-                        element_name=space.name or space.long_name,
-                        message=(
-                            f"Travel distance to nearest exit ({min_distance:.1f}m) "
-                            f"exceeds maximum allowed ({max_distance_units}m)"
-                        ),
-                        location={
-                            "x": space.centroid[0],
-                            "y": space.centroid[1],
-                            "z": space.centroid[2],
-                        },
-                        severity="error",
-                        actual_value=round(min_distance, 2),
-                        expected_value=max_distance_units,
-                    )
+        # Space centroids as (S, 3), skipping spaces without geometry
+        space_centroids = space_soa["centroid"]
+        located = np.flatnonzero(~np.isnan(space_centroids).any(axis=1))
+        if not len(located):
+            return self._create_result(passed=True, violations=[])
+        space_arr = space_centroids[located]
+
+        # Every space is within range of every exit when all of them fit in
+        # a box whose diagonal is within the limit, so nothing to search
+        points = np.vstack((space_arr, exit_arr))
+        extent = points.max(axis=0) - points.min(axis=0)
+        if float(extent @ extent) <= max_distance_units * max_distance_units:
+            return self._create_result(passed=True, violations=[])
+
+        # Nearest exit for every space from a KD-tree over the exits.
+        # The bound prunes every branch farther than the limit, so compliant
+        # spaces resolve quickly and out-of-range ones come back as inf.
+        tree = cKDTree(exit_arr)
+        min_distances, _ = tree.query(
+            space_arr, k=1, distance_upper_bound=max_distance_units, workers=-1
+        )
+        too_far = np.flatnonzero(np.isinf(min_distances))
+        if not len(too_far):
+            return self._create_result(passed=True, violations=[])
+
+        # Exact distances only for the pruned spaces; the bound is exclusive,
+        # so one sitting exactly on the limit still passes here
+        min_distances, _ = tree.query(space_arr[too_far], k=1, workers=-1)
+
+        # Build violations only for spaces beyond the limit
+        for i in np.flatnonzero(min_distances > max_distance_units):
+            space = spaces[located[too_far[i]]]
+            min_distance = float(min_distances[i])
+            violations.append(
+                Violation(
+                    element_id=space.id,
+                    element_type="IfcSpace",
+                    element_name=space.name or space.long_name,
+                    message=(
+                        f"Travel distance to nearest exit ({min_distance:.1f}m) "
+                        f"exceeds maximum allowed ({max_distance_units}m)"
+                    ),
+                    location=Location.from_point(space.centroid),
+                    severity="error",
+                    actual_value=round(min_distance, 2),
+                    expected_value=max_distance_units,
                 )
+            )
 
         return self._create_result(
             passed=len(violations) == 0,
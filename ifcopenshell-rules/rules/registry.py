@@ -2,10 +2,15 @@
 Rule registry for discovering and managing rules.
 """
 
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional
 
-from .base import BaseRule
+import ifcopenshell
+
+from .base import BaseRule, RuleResult
+from .context import RuleContext
 
 # Import rule implementations
 from .fire_safety.travel_distance import TravelDistanceRule
@@ -43,24 +48,36 @@ class RuleRegistry:
     def __init__(self, config_dir: Path):
         self.config_dir = config_dir
         self._rules: dict[str, list[BaseRule]] = {
-            "fire_safety": [],
-            "accessibility": [],
-            "building_control": [],
+            category: [] for category in RULE_CLASSES
         }
+        self._all: list[BaseRule] = []
+        self._by_id: dict[str, BaseRule] = {}
         self._load_rules()
 
     def _load_rules(self) -> None:
         """Load all rules from config directory."""
-        for category in self._rules.keys():
-            category_dir = self.config_dir / category
-            if not category_dir.exists():
+        for category, rules in self._rules.items():
+            # One directory listing per category; only known config
+            # names are looked at, so no pattern matching is needed
+            try:
+                with os.scandir(self.config_dir / category) as entries:
+                    config_files = [
+                        Path(entry.path)
+                        for entry in entries
+                        if entry.name in CONFIG_TO_RULE and entry.is_file()
+                    ]
+            except FileNotFoundError:
                 continue
 
-            for config_file in category_dir.glob("*.yaml"):
-                rule_class = CONFIG_TO_RULE.get(config_file.name)
-                if rule_class:
-                    rule = rule_class(config_path=config_file)
-                    self._rules[category].append(rule)
+            for config_file in config_files:
+                rule_class = CONFIG_TO_RULE[config_file.name]
+                rules.append(rule_class(config_path=config_file))
+
+        # Flat list in category order and an id index for lookups;
+        # the first rule wins if two share an id
+        self._all = [rule for rules in self._rules.values() for rule in rules]
+        for rule in self._all:
+            self._by_id.setdefault(rule.RULE_ID, rule)
 
     def get_rules_by_category(self, category: str) -> list[BaseRule]:
         """Get all rules for a category."""
@@ -68,15 +85,56 @@ class RuleRegistry:
 
     def get_all_rules(self) -> list[BaseRule]:
         """Get all registered rules."""
-        all_rules = []
-        for rules in self._rules.values():
-            all_rules.extend(rules)
-        return all_rules
+        return list(self._all)
+
+    def geometry_types(self, categories: Optional[Iterable[str]] = None) -> tuple[str, ...]:
+        """
+        Get the IFC types whose geometry the selected rules read.
+
+        Args:
+            categories: Categories that will run (all if None)
+
+        Returns:
+            Unique IFC type names in rule order
+        """
+        if categories is None:
+            rules = self.get_all_rules()
+        else:
+            rules = [r for c in categories for r in self.get_rules_by_category(c)]
+        return tuple(dict.fromkeys(t for rule in rules for t in rule.GEOMETRY_TYPES))
+
+    def run_all(
+        self,
+        model: ifcopenshell.file,
+        categories: Optional[Iterable[str]] = None,
+        workers: int = 1,
+    ) -> list[RuleResult]:
+        """
+        Check a model against all rules, or those of the given categories.
+
+        The rules share one RuleContext, so each element type is
+        extracted once for all of them. With workers > 1 the rules run
+        concurrently; the model is only read, so they can share it.
+
+        Args:
+            model: The IFC model to check
+            categories: Categories to run in order (all if None)
+            workers: Number of rules to check concurrently
+
+        Returns:
+            RuleResult of every rule, in category order
+        """
+        if categories is None:
+            rules = self.get_all_rules()
+        else:
+            rules = [r for c in categories for r in self.get_rules_by_category(c)]
+
+        context = RuleContext.for_model(model)
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as ex:
+                return list(ex.map(lambda rule: rule.check(model, context), rules))
+        return [rule.check(model, context) for rule in rules]
 
     def get_rule_by_id(self, rule_id: str) -> Optional[BaseRule]:
         """Get a specific rule by its ID."""
-        for rules in self._rules.values():
-            for rule in rules:
-                if rule.RULE_ID == rule_id:
-                    return rule
-        return None
+        return self._by_id.get(rule_id)
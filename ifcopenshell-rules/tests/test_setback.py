@@ -0,0 +1,77 @@
+"""
+Tests for the setback measurement of SetbackRule.
+"""
+
+import math
+
+import pytest
+
+shapely = pytest.importorskip("shapely")
+pytest.importorskip("ifcopenshell")
+
+import numpy as np
+from shapely.geometry import Polygon
+
+from rules.building_control.setback import SetbackRule
+
+
+def _footprints(*boxes):
+    """Wall footprints as an array of (min_x, min_y, max_x, max_y) boxes."""
+    b = np.asarray(boxes, dtype=np.float64)
+    return shapely.box(b[:, 0], b[:, 1], b[:, 2], b[:, 3])
+
+
+# A 20 x 12.2 building outline of four walls
+_WALLS = (
+    (10.0, 8.0, 30.0, 8.2),
+    (10.0, 20.0, 30.0, 20.2),
+    (10.0, 8.0, 10.2, 20.2),
+    (29.8, 8.0, 30.0, 20.2),
+)
+
+
+def test_rectangular_site_matches_bounds_offsets():
+    site = shapely.box(0.0, 0.0, 40.0, 30.0)
+
+    setbacks = SetbackRule._get_setbacks(site, _footprints(*_WALLS))
+
+    assert setbacks["front"] == pytest.approx(8.0)
+    assert setbacks["rear"] == pytest.approx(9.8)
+    assert setbacks["left"] == pytest.approx(10.0)
+    assert setbacks["right"] == pytest.approx(10.0)
+
+
+def test_building_past_a_side_gives_negative_setback():
+    site = shapely.box(0.0, 0.0, 40.0, 30.0)
+    shifted = [(x0, y0 - 10.0, x1, y1 - 10.0) for x0, y0, x1, y1 in _WALLS]
+
+    setbacks = SetbackRule._get_setbacks(site, _footprints(*shifted))
+
+    assert setbacks["front"] == pytest.approx(-2.0)
+    assert setbacks["rear"] == pytest.approx(19.8)
+    assert setbacks["left"] == pytest.approx(10.0)
+    assert setbacks["right"] == pytest.approx(10.0)
+
+
+def test_overshoot_near_a_corner_is_not_hidden():
+    site = shapely.box(0.0, 0.0, 40.0, 30.0)
+
+    setbacks = SetbackRule._get_setbacks(
+        site, _footprints(*_WALLS, (-1.0, 5.0, 5.0, 5.2))
+    )
+
+    assert setbacks["left"] == pytest.approx(-1.0)
+    assert setbacks["front"] == pytest.approx(5.0)
+
+
+def test_slanted_edge_is_measured_to_the_nearest_footprint():
+    # Rear boundary runs from (40, 30) to (0, 40): y = 40 - x / 4
+    site = Polygon([(0.0, 0.0), (40.0, 0.0), (40.0, 30.0), (0.0, 40.0)])
+
+    setbacks = SetbackRule._get_setbacks(site, _footprints((10.0, 10.0, 20.0, 20.0)))
+
+    # Nearest corner (20, 20), well inside the 40 m bounding box edge
+    assert setbacks["rear"] == pytest.approx(60.0 / math.sqrt(17.0))
+    assert setbacks["front"] == pytest.approx(10.0)
+    assert setbacks["left"] == pytest.approx(10.0)
+    assert setbacks["right"] == pytest.approx(20.0)